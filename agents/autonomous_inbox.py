@@ -9,16 +9,35 @@ This is the "always running" component that makes the system truly autonomous.
 """
 
 from __future__ import annotations
-from typing import Dict, Any, List, Optional, Generator, Callable
+from typing import Dict, Any, List, Optional, Generator, Callable, Deque, Tuple, Mapping
+from types import MappingProxyType
 from dataclasses import dataclass, field
+from collections import deque
 from datetime import datetime
 import time
 import threading
 import queue
+import asyncio
 import uuid
+import itertools
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Fast JSON encoder for event payloads (optional)
+try:
+    import orjson
+    _orjson_available = True
+except ImportError:
+    import json
+    _orjson_available = False
+
+
+def _dumps(obj: Any) -> bytes:
+    if _orjson_available:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str, ensure_ascii=False).encode("utf-8")
 
 from repos.data_repo import DataRepo
-from agents.react_agent import ReActAgent, ReasoningStep, StepType, AgentState
+from agents.react_agent import ReActAgent, ReasoningStep, AgentState
 from governance.approval import get_approval_queue, ApprovalPolicy
 from orchestration.autonomous_graph import process_email_with_graph
 
@@ -27,25 +46,92 @@ from orchestration.autonomous_graph import process_email_with_graph
 # EVENT TYPES FOR UI UPDATES
 # ============================================================
 
-@dataclass
+# Shared read-only default so metadata-less events don't each allocate a dict
+_EMPTY_META: Mapping[str, Any] = MappingProxyType({})
+
+_TS_CACHE_TTL = 0.1  # seconds
+_ts_cache: Tuple[float, str] = (0.0, "")
+
+
+def _on_event_loop() -> bool:
+    """True on a thread that is running an asyncio event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _now_iso() -> str:
+    """UTC ISO timestamp, shared by events emitted within the same 100ms tick"""
+    global _ts_cache
+    t = time.time()
+    cached_t, cached_s = _ts_cache
+    if t - cached_t < _TS_CACHE_TTL:
+        return cached_s
+    s = datetime.utcfromtimestamp(t).isoformat()
+    _ts_cache = (t, s)
+    return s
+
+
+@dataclass(slots=True)
 class AgentEvent:
     """Event emitted by the autonomous processor for UI updates"""
     event_id: str = field(default_factory=lambda: f"evt_{uuid.uuid4().hex[:8]}")
     event_type: str = ""  # new_email, thinking, action, observation, approval_needed, completed, error
     email_id: Optional[str] = None
     content: str = ""
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    metadata: Mapping[str, Any] = field(default_factory=lambda: _EMPTY_META)
+    timestamp: str = field(default_factory=_now_iso)
+    seq: int = -1  # Monotonic cursor assigned by ProcessorState.add_event
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+    _json_bytes: Optional[bytes] = field(default=None, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "event_id": self.event_id,
-            "event_type": self.event_type,
-            "email_id": self.email_id,
-            "content": self.content,
-            "metadata": self.metadata,
-            "timestamp": self.timestamp
-        }
+        # Events are not modified after emission, so the dict is built once
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "event_id": self.event_id,
+                "seq": self.seq,
+                "event_type": self.event_type,
+                "email_id": self.email_id,
+                "content": self.content,
+                "metadata": {} if self.metadata is _EMPTY_META else self.metadata,
+                "timestamp": self.timestamp
+            }
+        return self._cached_dict
+    
+    def to_json_bytes(self) -> bytes:
+        """UTF-8 JSON of to_dict(), encoded once per event (orjson when installed)"""
+        if self._json_bytes is None:
+            self._json_bytes = _dumps(self.to_dict())
+        return self._json_bytes
+
+
+# LangGraph node -> UI event type; anything else is an observation
+_NODE_EVENT_TYPE = {
+    "classify": "thinking",
+    "gather_context": "action",
+    "plan_actions": "thinking",
+    "execute_action": "action",
+}
+
+# ReAct step -> event type, indexed by StepType's int value
+_STEP_EVENT_TYPE = (
+    "thinking",         # THINK
+    "action",           # ACT
+    "observation",      # OBSERVE
+    "completed",        # FINISH
+    "approval_needed",  # AWAIT_APPROVAL
+    "info",             # AWAIT_INPUT
+    "info",             # ERROR
+)
+
+# Always recorded, even when nobody is listening
+_CRITICAL_EVENTS = frozenset({
+    "error", "completed", "approval_needed",
+    "processor_started", "processor_stopped"
+})
 
 
 # ============================================================
@@ -60,14 +146,31 @@ class ProcessorState:
     processed_count: int = 0
     error_count: int = 0
     last_check_time: Optional[str] = None
-    events: List[AgentEvent] = field(default_factory=list)
     max_events: int = 100  # Keep last N events
+    events: Deque[AgentEvent] = field(default=None)
+    _seq: itertools.count = field(default_factory=itertools.count, repr=False)
+    
+    def __post_init__(self) -> None:
+        # Bounded deque evicts the oldest event in O(1)
+        self.events = deque(self.events or (), maxlen=self.max_events)
     
     def add_event(self, event: AgentEvent) -> None:
+        event.seq = next(self._seq)
+        event._cached_dict = None
+        event._json_bytes = None
         self.events.append(event)
-        # Trim old events
-        if len(self.events) > self.max_events:
-            self.events = self.events[-self.max_events:]
+    
+    def events_after(self, since_seq: int) -> List[AgentEvent]:
+        """Events with seq > since_seq. Seqs in the buffer are contiguous, so the
+        cursor maps straight to a deque offset instead of a scan."""
+        if not self.events:
+            return []
+        start = since_seq - self.events[0].seq + 1
+        if start <= 0:
+            return list(self.events)
+        if start >= len(self.events):
+            return []
+        return list(itertools.islice(self.events, start, None))
 
 
 # ============================================================
@@ -80,7 +183,7 @@ class AutonomousInboxProcessor:
     
     Key features:
     - Polls for unprocessed emails
-    - Processes each email through the ReAct agent
+    - Processes emails through the ReAct agent on a bounded worker pool
     - Emits events for UI updates
     - Queues actions for approval when needed
     """
@@ -91,19 +194,49 @@ class AutonomousInboxProcessor:
         gateway = None,
         user_email: str = "kowshik.naidu@contoso.com",
         poll_interval: float = 5.0,
-        use_langgraph: bool = True
+        use_langgraph: bool = True,
+        max_workers: int = 5,
+        use_async: bool = False
     ):
         self.repo = repo or DataRepo()
         self.gateway = gateway
         self.user_email = user_email
         self.poll_interval = poll_interval
         self.use_langgraph = use_langgraph
+        self.max_workers = max_workers
+        self.use_async = use_async
         
         self.state = ProcessorState()
-        self.event_queue: queue.Queue = queue.Queue()
+        # Bounded (drop-oldest) fan-out queue drained by the dispatcher thread
+        self.event_queue: queue.Queue = queue.Queue(maxsize=1000)
+        self._dispatch_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
+        self._async_task = None  # concurrent.futures.Future of _arun_loop when use_async
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Futures submitted by the running poll; stop() waits on these, bounded
+        self._in_flight: set = set()
+        # Idle ReAct agents, reused across emails (at most one per worker)
+        self._react_pool: queue.LifoQueue = queue.LifoQueue(maxsize=max_workers)
+        
+        # Write-behind buffer for mark_email_processed (one inbox write per batch)
+        self._mark_buffer: queue.Queue = queue.Queue()
+        self._mark_thread: Optional[threading.Thread] = None
+        self._marks_in_flight: set = set()
+        self.mark_batch_size = 64
+        self.mark_flush_interval = 0.5
         self._callbacks: List[Callable[[AgentEvent], None]] = []
+        # Consecutive failures per callback; dropped after max_callback_failures
+        self._callback_failures: Dict[Callable[[AgentEvent], None], int] = {}
+        self.max_callback_failures = 3
+        
+        # Inbox change token from the last poll; idle polls skip the scan
+        self._last_seen_generation: Optional[tuple] = None
+        
+        # UI polls of get_state/get_events count as listeners for this long
+        self.listener_timeout = 60.0
+        self._last_poll = 0.0
     
     def add_callback(self, callback: Callable[[AgentEvent], None]) -> None:
         """Add callback to be notified of events"""
@@ -113,26 +246,100 @@ class AutonomousInboxProcessor:
         """Remove a callback"""
         if callback in self._callbacks:
             self._callbacks.remove(callback)
+        self._callback_failures.pop(callback, None)
+    
+    def _has_listeners(self) -> bool:
+        return bool(self._callbacks) or (time.monotonic() - self._last_poll) < self.listener_timeout
+    
+    def _wants_event(self, event_type: str) -> bool:
+        """Cheap pre-check so headless runs skip building per-step events"""
+        return event_type in _CRITICAL_EVENTS or self._has_listeners()
     
     def _emit_event(self, event: AgentEvent) -> None:
-        """Emit an event to all callbacks and queue"""
-        self.state.add_event(event)
-        self.event_queue.put(event)
-        for callback in self._callbacks:
+        """Record an event and hand it to the dispatcher; never blocks on callbacks"""
+        if not self._wants_event(event.event_type):
+            return
+        with self._lock:
+            self.state.add_event(event)
+        
+        if self._dispatch_thread is None:
+            # Not running - no dispatcher, deliver inline
+            self._dispatch(event)
+            return
+        
+        while True:
+            try:
+                self.event_queue.put_nowait(event)
+                return
+            except queue.Full:
+                # Slow consumers: drop the oldest pending event
+                try:
+                    self.event_queue.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    def _dispatch(self, event: AgentEvent) -> None:
+        for callback in list(self._callbacks):
             try:
                 callback(event)
-            except Exception:
-                pass
+            except Exception as e:
+                failures = self._callback_failures.get(callback, 0) + 1
+                if failures >= self.max_callback_failures:
+                    print(f"⚠️  Removing event callback {callback!r} after {failures} consecutive failures: {e}")
+                    self.remove_callback(callback)
+                else:
+                    self._callback_failures[callback] = failures
+            else:
+                if callback in self._callback_failures:
+                    del self._callback_failures[callback]
     
-    def start(self) -> None:
-        """Start the autonomous processor in background thread"""
+    def _dispatch_loop(self, events: queue.Queue) -> None:
+        """Fan events out to callbacks off the processing threads; None is the stop sentinel"""
+        while True:
+            event = events.get()
+            if event is None:
+                return
+            self._dispatch(event)
+    
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        Start the autonomous processor.
+        
+        With use_async the poll loop runs as a task on `loop` (or the running
+        loop) instead of a dedicated thread; without a loop it falls back to
+        the thread.
+        """
         if self.state.is_running:
             return
         
-        self._stop_event.clear()
+        if self.use_async and loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+        
+        # Fresh per-run stop event and queues: threads of a previous run that
+        # stop() didn't wait for (called on an event loop) keep their own, so
+        # they still see their stop and consume their own sentinels
+        self._stop_event = stop_event = threading.Event()
+        self.event_queue = queue.Queue(maxsize=1000)
+        self._mark_buffer = queue.Queue()
         self.state.is_running = True
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
+        self._last_poll = time.monotonic()  # started from the UI, assume it is watching
+        self._last_seen_generation = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="inbox-worker"
+        )
+        self._dispatch_thread = threading.Thread(target=self._dispatch_loop, args=(self.event_queue,), daemon=True)
+        self._dispatch_thread.start()
+        self._mark_thread = threading.Thread(target=self._mark_flusher, args=(self._mark_buffer,), daemon=True)
+        self._mark_thread.start()
+        if self.use_async and loop is not None:
+            self._async_task = asyncio.run_coroutine_threadsafe(self._arun_loop(stop_event), loop)
+        else:
+            self._thread = threading.Thread(target=self._run_loop, args=(stop_event,), daemon=True)
+            self._thread.start()
         
         self._emit_event(AgentEvent(
             event_type="processor_started",
@@ -140,42 +347,175 @@ class AutonomousInboxProcessor:
             metadata={"poll_interval": self.poll_interval}
         ))
     
-    def stop(self) -> None:
-        """Stop the autonomous processor"""
-        self._stop_event.set()
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the autonomous processor.
+        
+        Emails not yet started are dropped; ones already running get up to
+        `timeout` seconds to finish, like the poll thread's join. Called on an
+        event loop thread (the async poll loop's, or a route's) it only
+        signals and never blocks: running emails finish in the background.
+        A later start() gets a fresh stop event and queues, so such leftovers
+        wind down on their own instead of running alongside the new run.
+        """
+        with self._lock:
+            # Under the lock so a poll in flight can't submit past this point
+            self._stop_event.set()
         self.state.is_running = False
+        if _on_event_loop():
+            timeout = 0.0
         
         if self._thread:
-            self._thread.join(timeout=5.0)
+            self._thread.join(timeout=timeout)
             self._thread = None
         
+        # A poll already inside asyncio.to_thread keeps running; it sees its run's stop event
+        if self._async_task:
+            self._async_task.cancel()
+            self._async_task = None
+        
+        with self._lock:
+            executor, self._executor = self._executor, None
+            in_flight = list(self._in_flight)
+            self._in_flight.clear()
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            if in_flight:
+                wait(in_flight, timeout=timeout)
+        
+        # Each pooled agent owns a tool pool; release the idle ones' threads
+        while True:
+            try:
+                self._react_pool.get_nowait().close()
+            except queue.Empty:
+                break
+        
+        # Marks from here on are written directly; the flusher writes what was
+        # queued before the sentinel (waking early from its batch wait), then exits
+        with self._lock:
+            mark_thread, self._mark_thread = self._mark_thread, None
+            if mark_thread:
+                self._mark_buffer.put(None)
+        if mark_thread:
+            mark_thread.join(timeout=timeout)
+        
         self._emit_event(AgentEvent(
             event_type="processor_stopped",
             content="⏹️ Autonomous processor stopped."
         ))
+        
+        # Let the dispatcher deliver what is queued, then exit on the sentinel
+        # (later events from late workers are delivered inline)
+        dispatch_thread, self._dispatch_thread = self._dispatch_thread, None
+        if dispatch_thread:
+            self.event_queue.put(None)
+            dispatch_thread.join(timeout=timeout)
     
-    def _run_loop(self) -> None:
-        """Main processing loop"""
-        while not self._stop_event.is_set():
-            try:
-                self._check_and_process()
-            except Exception as e:
+    def _mark_processed(self, email_id: str, actions_taken: List[str], category: str) -> None:
+        """Queue a processed-mark for the flusher, or write directly when not running"""
+        with self._lock:
+            # Checked under the lock so nothing is queued behind stop()'s sentinel
+            if self._mark_thread is not None:
+                self._marks_in_flight.add(email_id)
+                self._mark_buffer.put({
+                    "email_id": email_id,
+                    "actions_taken": actions_taken,
+                    "category": category
+                })
+                return
+        self.repo.mark_email_processed(email_id, actions_taken=actions_taken, category=category)
+    
+    def _mark_flusher(self, buffer: queue.Queue) -> None:
+        """
+        Background writer: flushes marks every batch_size items or
+        flush_interval. None (queued by stop()) flushes the pending batch and
+        exits.
+        """
+        while True:
+            item = buffer.get()
+            if item is None:
+                return
+            batch = [item]
+            
+            deadline = time.monotonic() + self.mark_flush_interval
+            stopping = False
+            while len(batch) < self.mark_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = buffer.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            self._flush_marks(batch)
+            if stopping:
+                return
+    
+    def _flush_marks(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self.repo.mark_emails_processed_batch(batch)
+        except Exception as e:
+            # Inbox unchanged on disk; force the next poll to rescan
+            self._last_seen_generation = None
+            with self._lock:
                 self.state.error_count += 1
-                self._emit_event(AgentEvent(
-                    event_type="error",
-                    content=f"❌ Error in processing loop: {str(e)}",
-                    metadata={"error": str(e)}
-                ))
+            self._emit_event(AgentEvent(
+                event_type="error",
+                content=f"❌ Failed to mark {len(batch)} email(s) processed: {str(e)}",
+                metadata={"error": str(e)}
+            ))
+        finally:
+            with self._lock:
+                self._marks_in_flight.difference_update(m["email_id"] for m in batch)
+    
+    def _poll_once(self, stop_event: Optional[threading.Event] = None) -> None:
+        try:
+            self._check_and_process(stop_event)
+        except Exception as e:
+            with self._lock:
+                self.state.error_count += 1
+            self._emit_event(AgentEvent(
+                event_type="error",
+                content=f"❌ Error in processing loop: {str(e)}",
+                metadata={"error": str(e)}
+            ))
+    
+    def _run_loop(self, stop_event: threading.Event) -> None:
+        """Main processing loop"""
+        while not stop_event.is_set():
+            self._poll_once(stop_event)
             
             # Wait for next poll
-            self._stop_event.wait(self.poll_interval)
+            stop_event.wait(self.poll_interval)
+    
+    async def _arun_loop(self, stop_event: threading.Event) -> None:
+        """Async processing loop: shares the caller's event loop instead of owning a thread"""
+        while not stop_event.is_set():
+            # Repo and LLM calls are blocking; keep them off the event loop
+            await asyncio.to_thread(self._poll_once, stop_event)
+            await asyncio.sleep(self.poll_interval)
     
-    def _check_and_process(self) -> None:
-        """Check for unprocessed emails and process them"""
-        self.state.last_check_time = datetime.utcnow().isoformat()
+    def _check_and_process(self, stop_event: Optional[threading.Event] = None) -> None:
+        """Check for unprocessed emails and process them (for the run owning stop_event)"""
+        stop_event = stop_event or self._stop_event
+        self.state.last_check_time = _now_iso()
+        
+        # Nothing written to the inbox since the last scan - nothing new to do
+        generation = self.repo.inbox_generation()
+        if generation == self._last_seen_generation:
+            return
+        self._last_seen_generation = generation
         
-        # Get unprocessed emails
+        # Get unprocessed emails (skip ones whose mark is still buffered)
         unprocessed = self.repo.get_unprocessed_emails()
+        with self._lock:
+            if self._marks_in_flight:
+                unprocessed = [e for e in unprocessed if e.get("email_id") not in self._marks_in_flight]
         
         if not unprocessed:
             return
@@ -186,17 +526,44 @@ class AutonomousInboxProcessor:
             metadata={"count": len(unprocessed)}
         ))
         
-        # Process each email
-        for email in unprocessed:
-            if self._stop_event.is_set():
-                break
-            
-            self._process_single_email(email)
+        # Process emails concurrently - each one is bound on LLM / graph I/O.
+        # Checked under the lock: stop() may have shut the executor down meanwhile
+        with self._lock:
+            if stop_event.is_set():
+                # Not processed: don't let the token make the next run skip them
+                self._last_seen_generation = None
+                return
+            executor = self._executor
+            if executor is not None:
+                submitted = {
+                    executor.submit(self._process_single_email, email)
+                    for email in unprocessed
+                }
+                self._in_flight.update(submitted)
+        
+        if executor is None:
+            for email in unprocessed:
+                if stop_event.is_set():
+                    break
+                self._process_single_email(email)
+            return
+        
+        pending = submitted
+        while pending and not stop_event.is_set():
+            _, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+        
+        # Stop requested: drop emails that have not started yet
+        for future in pending:
+            future.cancel()
+        # Ones still running stay in _in_flight for stop() to wait on
+        with self._lock:
+            self._in_flight.difference_update(f for f in submitted if f.done())
     
     def _process_single_email(self, email: Dict[str, Any]) -> None:
         """Process a single email through the agent"""
         email_id = email.get("email_id", "unknown")
-        self.state.current_email_id = email_id
+        with self._lock:
+            self.state.current_email_id = email_id
         
         # Emit start event
         self._emit_event(AgentEvent(
@@ -216,10 +583,12 @@ class AutonomousInboxProcessor:
             else:
                 self._process_with_react(email)
             
-            self.state.processed_count += 1
+            with self._lock:
+                self.state.processed_count += 1
             
         except Exception as e:
-            self.state.error_count += 1
+            with self._lock:
+                self.state.error_count += 1
             self._emit_event(AgentEvent(
                 event_type="error",
                 email_id=email_id,
@@ -228,13 +597,15 @@ class AutonomousInboxProcessor:
             ))
             
             # Mark as processed anyway to avoid infinite loop
-            self.repo.mark_email_processed(
+            self._mark_processed(
                 email_id,
                 actions_taken=["error"],
                 category="error"
             )
         
-        self.state.current_email_id = None
+        with self._lock:
+            if self.state.current_email_id == email_id:
+                self.state.current_email_id = None
     
     def _process_with_langgraph(self, email: Dict[str, Any]) -> None:
         """Process email using LangGraph workflow"""
@@ -248,19 +619,9 @@ class AutonomousInboxProcessor:
                 thought = node_state.get("current_thought", "")
                 status = node_state.get("status", "")
                 
-                # Map to event types
-                if node_name == "classify":
-                    event_type = "thinking"
-                elif node_name == "gather_context":
-                    event_type = "action"
-                elif node_name == "plan_actions":
-                    event_type = "thinking"
-                elif node_name == "execute_action":
-                    event_type = "action"
-                else:
-                    event_type = "observation"
+                event_type = _NODE_EVENT_TYPE.get(node_name, "observation")
                 
-                if thought:
+                if thought and self._wants_event(event_type):
                     self._emit_event(AgentEvent(
                         event_type=event_type,
                         email_id=email_id,
@@ -300,7 +661,7 @@ class AutonomousInboxProcessor:
             executed = final_state.get("executed_actions", [])
             category = final_state.get("email_analysis", {}).get("category", "unknown")
             
-            self.repo.mark_email_processed(
+            self._mark_processed(
                 email_id,
                 actions_taken=executed,
                 category=category
@@ -319,43 +680,51 @@ class AutonomousInboxProcessor:
     
     def _process_with_react(self, email: Dict[str, Any]) -> None:
         """Process email using ReAct agent"""
+        # Reuse a pooled agent, or create one
+        try:
+            agent = self._react_pool.get_nowait()
+        except queue.Empty:
+            agent = ReActAgent(
+                repo=self.repo,
+                gateway=self.gateway,
+                user_email=self.user_email,
+                max_iterations=10
+            )
+        try:
+            self._run_react(agent, email)
+        finally:
+            agent.reset()
+            pooled = False
+            if not self._stop_event.is_set():
+                try:
+                    self._react_pool.put_nowait(agent)
+                    pooled = True
+                except queue.Full:
+                    pass
+            if not pooled:
+                # Not kept for reuse: release its tool threads now
+                agent.close()
+    
+    def _run_react(self, agent: ReActAgent, email: Dict[str, Any]) -> None:
+        """Drive the ReAct loop for one email and emit its steps"""
         email_id = email.get("email_id")
         
-        # Create agent
-        agent = ReActAgent(
-            repo=self.repo,
-            gateway=self.gateway,
-            user_email=self.user_email,
-            max_iterations=10
-        )
-        
         # Process and emit events
-        final_state = None
         for step in agent.process_email(email):
             # Map ReasoningStep to AgentEvent
-            if step.step_type == StepType.THINK:
-                event_type = "thinking"
-            elif step.step_type == StepType.ACT:
-                event_type = "action"
-            elif step.step_type == StepType.OBSERVE:
-                event_type = "observation"
-            elif step.step_type == StepType.FINISH:
-                event_type = "completed"
-            elif step.step_type == StepType.AWAIT_APPROVAL:
-                event_type = "approval_needed"
-            else:
-                event_type = "info"
+            event_type = _STEP_EVENT_TYPE[step.step_type]
             
-            self._emit_event(AgentEvent(
-                event_type=event_type,
-                email_id=email_id,
-                content=step.content,
-                metadata={
-                    "tool": step.tool_name,
-                    "iteration": step.iteration,
-                    "result": step.tool_result
-                }
-            ))
+            if self._wants_event(event_type):
+                self._emit_event(AgentEvent(
+                    event_type=event_type,
+                    email_id=email_id,
+                    content=step.content,
+                    metadata={
+                        "tool": step.tool_name,
+                        "iteration": step.iteration,
+                        "result": step.tool_result
+                    }
+                ))
             
             # Handle approval queue
             if step.tool_result and step.tool_result.get("requires_approval"):
@@ -368,11 +737,8 @@ class AutonomousInboxProcessor:
                     agent_reasoning=step.content
                 )
         
-        # The generator returns the final state
-        # (Note: In Python, you'd need to catch the return value differently)
-        
         # Mark email as processed
-        self.repo.mark_email_processed(
+        self._mark_processed(
             email_id,
             actions_taken=["react_processed"],
             category="processed"
@@ -384,8 +750,7 @@ class AutonomousInboxProcessor:
         Yields events as they occur.
         """
         # Find the email
-        emails = self.repo.inbox()
-        email = next((e for e in emails if e.get("email_id") == email_id), None)
+        email = self.repo.email_by_id(email_id)
         
         if not email:
             yield AgentEvent(
@@ -411,7 +776,7 @@ class AutonomousInboxProcessor:
                 thought = node_state.get("current_thought", "")
                 if thought:
                     yield AgentEvent(
-                        event_type="thinking" if "Think" in thought else "observation",
+                        event_type=_NODE_EVENT_TYPE.get(node_name, "observation"),
                         email_id=email_id,
                         content=thought,
                         metadata={"node": node_name}
@@ -430,24 +795,56 @@ class AutonomousInboxProcessor:
             content="✅ Processing complete"
         )
     
-    def get_state(self) -> Dict[str, Any]:
-        """Get current processor state for UI"""
+    def _state_fields(self) -> Dict[str, Any]:
         return {
             "is_running": self.state.is_running,
             "current_email_id": self.state.current_email_id,
             "processed_count": self.state.processed_count,
             "error_count": self.state.error_count,
             "last_check_time": self.state.last_check_time,
-            "recent_events": [e.to_dict() for e in self.state.events[-20:]]
         }
     
-    def get_events(self, since: Optional[str] = None) -> List[AgentEvent]:
-        """Get events, optionally filtered by timestamp"""
+    def get_state(self) -> Dict[str, Any]:
+        """Get current processor state for UI"""
+        self._last_poll = time.monotonic()
+        with self._lock:
+            recent = list(self.state.events)[-20:]
+        state = self._state_fields()
+        state["recent_events"] = [e.to_dict() for e in recent]
+        return state
+    
+    def get_state_json(self) -> bytes:
+        """
+        get_state() as UTF-8 JSON for HTTP handlers. Events are spliced in from
+        their cached bytes, so a UI polling every second re-encodes only the
+        few counters.
+        """
+        self._last_poll = time.monotonic()
+        with self._lock:
+            recent = list(self.state.events)[-20:]
+        head = _dumps(self._state_fields())
+        return b"".join((
+            head[:-1], b',"recent_events":[',
+            b",".join(e.to_json_bytes() for e in recent), b"]}"
+        ))
+    
+    def get_events(self, since: Optional[str] = None, since_seq: Optional[int] = None) -> List[AgentEvent]:
+        """
+        Get events, optionally filtered by cursor.
+        
+        Prefer since_seq (the last event's `seq` the client saw); the
+        timestamp filter is kept for older callers.
+        """
+        self._last_poll = time.monotonic()
+        with self._lock:
+            if since_seq is not None:
+                return self.state.events_after(since_seq)
+            events = list(self.state.events)
         if not since:
-            return self.state.events[-20:]
+            return events[-20:]
         
         return [
-            e for e in self.state.events
+            e for e in events
             if e.timestamp > since
         ]
 
@@ -489,3 +886,9 @@ def get_processor_state() -> Dict[str, Any]:
     """Get current processor state"""
     processor = get_processor()
     return processor.get_state()
+
+
+def get_processor_state_json() -> bytes:
+    """Current processor state, JSON-encoded for HTTP responses"""
+    processor = get_processor()
+    return processor.get_state_json()
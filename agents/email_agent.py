@@ -1,8 +1,9 @@
 
 from __future__ import annotations
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from agents.schemas import EmailTriageResult, ExtractedAction
 from agents import prompts
+from agents.prompt_cache import cached_call
 from repos.data_repo import DataRepo
 from governance.gateway import PolicyGateway
 from governance.audit import write_audit
@@ -12,14 +13,21 @@ class EmailAgent:
         self.repo = repo
         self.gw = PolicyGateway("email_agent")
 
+    def _cached_llm(self, prompt_id: str, parts: Tuple[str, ...], prompt: str, correlation_id: Optional[str]) -> str:
+        # Responses are shared across EmailAgent instances, so a re-processed
+        # email (retry, restart, duplicate delivery) skips the LLM.
+        return cached_call(prompt_id, parts, lambda: self.gw.call_llm(prompt, correlation_id=correlation_id))
+
     def _summarize(self, email: Dict[str, Any]) -> str:
-        p = prompts.EMAIL_SUMMARY_PROMPT.format(subject=email["subject"], body=email["body_text"])
-        return self.gw.call_llm(p, correlation_id=email.get("correlation_id"))
+        p = prompts.render_email_summary(subject=email["subject"], body=email["body_text"])
+        parts = (email["subject"], email["body_text"])
+        return self._cached_llm("email_summary", parts, p, email.get("correlation_id"))
 
     def _extract_actions(self, email: Dict[str, Any]) -> List[ExtractedAction]:
         # For Phase-1, try LLM; fallback to trivial heuristic (look for "by <date>" patterns)
-        p = prompts.EMAIL_ACTIONS_PROMPT.format(subject=email["subject"], body=email["body_text"])
-        text = self.gw.call_llm(p, correlation_id=email.get("correlation_id"))
+        p = prompts.render_email_actions(subject=email["subject"], body=email["body_text"])
+        parts = (email["subject"], email["body_text"])
+        text = self._cached_llm("email_actions", parts, p, email.get("correlation_id"))
         # Lenient parse (LLM-simulated path returns plain text) -> keep empty list on failure
         try:
             import json
@@ -29,14 +37,17 @@ class EmailAgent:
             return []
 
     def _draft_reply(self, email: Dict[str, Any], user_ctx: Dict[str, Any]) -> str:
-        p = prompts.EMAIL_REPLY_PROMPT.format(
-            tone=user_ctx.get("communication_tone","neutral"),
+        tone = user_ctx.get("communication_tone","neutral")
+        signature = f"{user_ctx.get('display_name','')} \n{user_ctx.get('title','')}"
+        p = prompts.render_email_reply(
+            tone=tone,
             from_email=email["from_email"],
             subject=email["subject"],
             body=email["body_text"],
-            signature=f"{user_ctx.get('display_name','')} \n{user_ctx.get('title','')}"
+            signature=signature
         )
-        return self.gw.call_llm(p, correlation_id=email.get("correlation_id"))
+        parts = (email["subject"], email["body_text"], email["from_email"], tone, signature)
+        return self._cached_llm("email_reply", parts, p, email.get("correlation_id"))
 
     def analyze_actionability(self, email: Dict[str, Any]) -> str:
         """Analyze email actionability and return classification."""
@@ -1,21 +1,51 @@
 from __future__ import annotations
-from typing import List
+from typing import List, Dict, Any, Optional, Tuple
 from agents.schemas import NudgeDraft
 from agents import prompts
+from agents.prompt_cache import cached_call
 from governance.audit import write_audit
 from governance.gateway import PolicyGateway
 from repos.data_repo import DataRepo
+from datetime import datetime
 import re
+
+NUDGE_CACHE_TTL = 7 * 86400
+
+def _due_day(due_date: Any) -> str:
+    return due_date[:10] if isinstance(due_date, str) else ""
+
+def _overdue_bucket(due_date: Any, today: str) -> str:
+    """ontrack | today | overdue_<7d | overdue_>7d (ISO day strings compare in date order)"""
+    day = _due_day(due_date)
+    if len(day) != 10 or not day[:4].isdigit():
+        return "ontrack"
+    if day > today:
+        return "ontrack"
+    if day == today:
+        return "today"
+    try:
+        late = (datetime.fromisoformat(today) - datetime.fromisoformat(day)).days
+    except ValueError:
+        return "overdue_<7d"
+    return "overdue_<7d" if late < 7 else "overdue_>7d"
+
 class FollowupAgent:
     def __init__(self, repo: DataRepo):
         self.repo = repo
         self.gw = PolicyGateway("followup_agent")
-    
-    
+        self._tasks_idx_cache: Optional[Tuple[int, Dict[str, Dict[str, Any]]]] = None
+
+    def _tasks_by_id(self) -> Dict[str, Dict[str, Any]]:
+        """task_id -> task, rebuilt only when the repo's tasks generation changes"""
+        ver = self.repo.version("tasks")
+        if self._tasks_idx_cache is None or self._tasks_idx_cache[0] != ver:
+            self._tasks_idx_cache = (ver, {t["task_id"]: t for t in self.repo.tasks()})
+        return self._tasks_idx_cache[1]
 
     def nudges(self) -> List[NudgeDraft]:
         drafts = []
-        tasks_by_id = {t["task_id"]: t for t in self.repo.tasks()}
+        today = datetime.utcnow().date().isoformat()
+        tasks_by_id = self._tasks_by_id()
 
         for fu in self.repo.followups():
             t = tasks_by_id.get(fu["entity_id"], {})
@@ -27,18 +57,26 @@ class FollowupAgent:
             # Handle missing owner_user_id gracefully
             owner = t.get("owner_user_id") or fu.get("owner_user_id", "unknown")
 
-            p = prompts.NUDGE_PROMPT.format(
-                title=title,
-                priority=priority,
-                status=status,
-                due_date=due_date,
-                reason=fu.get("reason",""),
-                channel=fu.get("recommended_channel","email"),
-                owner=owner
-            )
             def _strip_markdown(text: str) -> str:
                 return re.sub(r"\*+", "", text)
-            text = self.gw.call_llm(p, correlation_id=fu.get("correlation_id"))
+            reason = fu.get("reason","")
+            channel = fu.get("recommended_channel","email")
+            # Day-precision due date plus overdue bucket: the daily re-nudge of an
+            # unchanged task hits, while crossing into "overdue" regenerates
+            parts = (title, priority, status, _due_day(due_date), _overdue_bucket(due_date, today),
+                     reason, channel, owner)
+            text = cached_call("nudge", parts, lambda: self.gw.call_llm(
+                prompts.render_nudge(
+                    title=title,
+                    priority=priority,
+                    status=status,
+                    due_date=due_date,
+                    reason=reason,
+                    channel=channel,
+                    owner=owner
+                ),
+                correlation_id=fu.get("correlation_id")
+            ), ttl=NUDGE_CACHE_TTL)
             text = _strip_markdown(text.strip())
             drafts.append(NudgeDraft(
                 followup_id=fu["followup_id"],
@@ -1,8 +1,10 @@
 from __future__ import annotations
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import json, re
 from agents.schemas import MoM
 from agents import prompts
+from agents.prompt_cache import cached_llm
+from agents.token_budget import truncate_to_tokens
 from repos.data_repo import DataRepo
 from governance.gateway import PolicyGateway
 from governance.audit import write_audit
@@ -14,45 +16,69 @@ SECTION_PREFIXES = (
     "dependency:", "dependencies:"
 )
 
+# One alternation compiled from SECTION_PREFIXES (longest first) instead of a startswith loop
+_PREFIX_RE = re.compile(
+    "|".join(re.escape(p) for p in sorted(SECTION_PREFIXES, key=len, reverse=True)),
+    re.IGNORECASE
+)
+
 def _strip_prefix(s: str) -> str:
     s0 = s.strip().lstrip("-•").strip()
-    s1 = s0
-    low = s0.lower()
-    for p in SECTION_PREFIXES:
-        if low.startswith(p):
-            s1 = s0[len(p):].strip()
-            break
-    return s1
+    m = _PREFIX_RE.match(s0)
+    return s0[m.end():].strip() if m else s0
+
+# Transcript budget for the MoM prompt (previously a flat 7000-char cut)
+MOM_TRANSCRIPT_TOKENS = 1750
+
+# Transcript cleanup before prompting: each pass is one C-level regex sweep
+_TIMESTAMP_RE = re.compile(r"\[(?:\d{1,2}:)?\d{1,2}:\d{2}(?:\.\d+)?\]")
+_HSPACE_RE = re.compile(r"[ \t\f\v]+")
+_BLANK_LINES_RE = re.compile(r"\s*\n\s*\n\s*")
+
+def clean_transcript(transcript: str) -> str:
+    """Drop [HH:MM:SS] stamps and collapse whitespace so the prompt budget goes to content."""
+    text = _TIMESTAMP_RE.sub("", transcript)
+    text = _HSPACE_RE.sub(" ", text)
+    text = _BLANK_LINES_RE.sub("\n", text)
+    return "\n".join(line.strip() for line in text.strip().split("\n"))
+
+# Section keywords, found with one scan per line; priority order decides the bucket
+_KEYWORD_RE = re.compile("summary|decision|action|risk|dependenc")
+_BUCKET_PRIORITY = ("decision", "action", "risk", "dependenc")
+_NON_SUMMARY_WORDS = frozenset(("decision", "action", "risk"))
 
 def _heuristic_parse(text: str) -> Dict[str, Any]:
     """Fallback parsing when JSON is not returned."""
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
     summary = ""
+    first_clean = None
     decisions: List[str] = []
     actions: List[str] = []
     risks: List[str] = []
     deps: List[str] = []
+    buckets = {"decision": decisions, "action": actions, "risk": risks, "dependenc": deps}
 
-    # Try to identify blocks by keyword
-    for ln in lines:
+    # Single pass: strip each line once, then identify blocks by keyword
+    for raw in text.splitlines():
+        ln = raw.strip()
+        if not ln:
+            continue
         ln_clean = _strip_prefix(ln)
-        l = ln.lower()
-        if not summary and ("summary" in l or ("decision" not in l and "action" not in l and "risk" not in l and len(ln_clean.split()) > 3)):
+        if first_clean is None:
+            first_clean = ln_clean
+        found = set(_KEYWORD_RE.findall(ln.lower()))
+        if not summary and ("summary" in found or (not (found & _NON_SUMMARY_WORDS) and len(ln_clean.split()) > 3)):
             # First decent sentence becomes summary
             summary = ln_clean if ln_clean else ln
             continue
 
-        if "decision" in l:
-            decisions.append(ln_clean or ln)
-        elif "action" in l:
-            actions.append(ln_clean or ln)
-        elif "risk" in l:
-            risks.append(ln_clean or ln)
-        elif "dependenc" in l:
-            deps.append(ln_clean or ln)
+        if found:
+            for kw in _BUCKET_PRIORITY:
+                if kw in found:
+                    buckets[kw].append(ln_clean or ln)
+                    break
 
-    if not summary and lines:
-        summary = _strip_prefix(lines[0])[:400]
+    if not summary and first_clean is not None:
+        summary = first_clean[:400]
 
     # Deduplicate and drop obviously wrong “prefixed leftovers”
     def clean_list(arr: List[str]) -> List[str]:
@@ -80,24 +106,26 @@ class MeetingAgent:
         self.repo = repo
         self.gw = PolicyGateway("meeting_agent")
 
+    @cached_llm("mom", key=lambda self, transcript, correlation_id: (transcript,))
+    def _mom_text(self, transcript: str, correlation_id: Optional[str]) -> str:
+        return self.gw.call_llm(prompts.render_mom(transcript=transcript), correlation_id=correlation_id)
+
     def generate_mom(self, meeting_id: str) -> MoM:
         mtg = next(m for m in self.repo.meetings() if m["meeting_id"] == meeting_id)
         transcript = self.repo.get_transcript(mtg.get("transcript_file"))
-        if not transcript.strip():
+        if not transcript or transcript.isspace():
             transcript = (
                 f"[No transcript available]\n"
                 f"Meeting: {mtg.get('title','')}\n"
                 f"Participants: {', '.join(mtg.get('participant_emails', []))}"
             )
 
-        text = self.gw.call_llm(
-            prompts.MOM_PROMPT.format(transcript=transcript[:7000]),
-            correlation_id=mtg.get("correlation_id")
-        ).strip()
+        transcript = truncate_to_tokens(clean_transcript(transcript), MOM_TRANSCRIPT_TOKENS)
+        text = self._mom_text(transcript, mtg.get("correlation_id")).strip()
 
         # 1) Try strict JSON parse
         parsed = None
-        if text and text.startswith("{"):
+        if text[:1] == "{":
             try:
                 obj = json.loads(text)
                 parsed = {
@@ -0,0 +1,127 @@
+"""
+Prompt Response Cache
+=====================
+Process-wide cache for LLM responses, keyed on a prompt id plus a hash of the
+prompt inputs. Retries, re-opens and EOD rollups re-run the same summary /
+MoM / nudge prompts on identical content; a hit skips the LLM round-trip
+entirely.
+
+The governance gateway keeps its own disk cache keyed on the full prompt
+text; this layer sits in front of it and never touches disk. Inputs are
+matched exactly unless their prompt id is listed in _FOLDED_PROMPTS, where
+whitespace and case differences share an entry.
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from collections import OrderedDict
+from functools import wraps
+import hashlib
+import threading
+import time
+
+
+DEFAULT_TTL = 86400  # 24h, same as the gateway disk cache
+
+# Opt-in: prompts whose inputs are canonicalized before hashing. Only for
+# inputs where case/spacing carries no meaning - MoM transcripts are re-read
+# from files whose line endings and wrapping vary between saves. Everything
+# else (replies, ReAct decisions carrying ids and tool parameters) is exact.
+_FOLDED_PROMPTS = frozenset({"mom"})
+
+
+def canonicalize(text: Optional[str]) -> str:
+    """Collapse whitespace runs and casefold, so cosmetic edits share a key"""
+    return " ".join((text or "").split()).casefold()
+
+
+def content_key(prompt_id: str, parts: Iterable[Any]) -> str:
+    normalize = canonicalize if prompt_id in _FOLDED_PROMPTS else str
+    h = hashlib.blake2b(prompt_id.encode("utf-8"), digest_size=16)
+    for part in parts:
+        h.update(b"\x00")
+        h.update(normalize(part if isinstance(part, str) else str(part)).encode("utf-8"))
+    return h.hexdigest()
+
+
+class PromptCache:
+    """Thread-safe LRU with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: Any, ttl: float = DEFAULT_TTL) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+_CACHE = PromptCache()
+
+
+def cached_call(prompt_id: str, parts: Iterable[Any], compute: Callable[[], Any],
+                ttl: float = DEFAULT_TTL) -> Any:
+    """Return the cached response for (prompt_id, parts), calling compute() on a miss"""
+    key = content_key(prompt_id, parts)
+    value = _CACHE.get(key)
+    if value is None:
+        value = compute()
+        _CACHE.put(key, value, ttl)
+    return value
+
+
+def cache_get(prompt_id: str, parts: Iterable[Any]) -> Optional[Any]:
+    """Cached response for (prompt_id, parts), or None; for callers that can't wrap a compute()"""
+    return _CACHE.get(content_key(prompt_id, parts))
+
+
+def cache_put(prompt_id: str, parts: Iterable[Any], value: Any, ttl: float = DEFAULT_TTL) -> None:
+    _CACHE.put(content_key(prompt_id, parts), value, ttl)
+
+
+def cached_llm(prompt_id: str, key: Callable[..., Iterable[Any]], ttl: float = DEFAULT_TTL):
+    """
+    Decorator form of cached_call. `key` receives the wrapped function's
+    arguments and returns the inputs that determine the response.
+    """
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            return cached_call(prompt_id, key(*args, **kwargs), lambda: fn(*args, **kwargs), ttl)
+        return wrapper
+    return decorator
+
+
+def clear_prompt_cache() -> None:
+    _CACHE.clear()
+
+
+def prompt_cache_stats() -> Dict[str, int]:
+    return _CACHE.stats()
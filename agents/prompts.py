@@ -1,3 +1,21 @@
+from typing import Callable, Dict
+from string import Formatter
+from pathlib import Path
+import re
+
+try:
+    import jinja2
+    _jinja_available = True
+except ImportError:
+    _jinja_available = False
+
+# Longer prompts live as Jinja2 templates under agents/templates/
+_TEMPLATES_DIR = Path(__file__).with_name("templates")
+
+
+def _read_template(name: str) -> str:
+    return (_TEMPLATES_DIR / name).read_text(encoding="utf-8")
+
 
 EMAIL_SUMMARY_PROMPT = """Summarize the email in a brief paragraph (2-3 sentences). Focus on:
 - What is being asked or requested
@@ -27,29 +45,7 @@ Signature:
 {signature}
 """
 
-MOM_PROMPT = """You are an expert Meeting Intelligence agent creating detailed Minutes of Meeting (MoM).
-
-Analyze the transcript carefully and extract SPECIFIC, DETAILED information. DO NOT use generic phrases.
-
-Return a STRICT JSON object with these keys:
-- summary (string): 3-5 sentences capturing the main discussion topics, key participants, and overall outcome. Be SPECIFIC about what was discussed.
-- decisions (array of strings): Each decision should be a complete, specific statement. Include WHO decided, WHAT was decided, and any numbers/dates mentioned.
-- action_items (array of strings): Each item should include: WHAT needs to be done, WHO is responsible (if mentioned), and WHEN (deadline if mentioned). Be specific!
-- risks (array of strings): Specific risks mentioned with context. Include impact if discussed.
-- dependencies (array of strings): External dependencies, blockers, or things needed from others.
-
-CRITICAL RULES:
-1. Extract ACTUAL content from the transcript - no generic placeholders
-2. Include specific names, numbers, dates, and technical details mentioned
-3. If someone says "I'll send X by Friday" → action item: "[Person] to send X by Friday"
-4. If a specific decision was made → include the actual decision with details
-5. Quote key metrics, costs, timelines mentioned (e.g., "$500k budget", "4-5 months", "99.97% uptime")
-6. No markdown, no code fences - return ONLY valid JSON
-7. If nothing found for a section, return empty array []
-
-Transcript:
-{transcript}
-"""
+MOM_PROMPT = _read_template("mom.j2")
 
 NUDGE_PROMPT = """
 You are generating a short follow‑up nudge based on a specific task.
@@ -83,13 +79,7 @@ Recommended Channel: {channel}
 Owner: {owner}
 """
 
-EOD_PROMPT = """Craft a crisp end-of-day summary based on tasks and followups. Include Completed, In Progress, Pending highlights and mention risks if any.
-Data:
-- completed: {completed}
-- in_progress: {in_progress}
-- pending: {pending}
-- followups: {followups}
-"""
+EOD_PROMPT = _read_template("eod.j2")
 
 # ============================================================
 # WELLNESS AGENT PROMPTS
@@ -205,3 +195,93 @@ Generate a brief celebration message (1-2 sentences) that:
 
 Keep it natural and professional. Plain text only.
 """
+
+
+# ============================================================
+# COMPILED PROMPT RENDERERS
+# ============================================================
+
+def compile_prompt(template: str) -> Callable[..., str]:
+    """
+    Compile a str.format-style template into a keyword-only f-string function.
+    The template is parsed once here, so rendering skips str.format's per-call
+    parse. Templates using conversions/format specs fall back to format_map.
+    """
+    parts = list(Formatter().parse(template))
+    fields = [f for _, f, _, _ in parts if f is not None]
+    if any(spec or conv for _, _, spec, conv in parts) or not all(f.isidentifier() for f in fields):
+        return lambda **kw: template.format_map(kw)
+
+    body = "".join(
+        "{_L[%d]}" % i + ("{%s}" % f if f is not None else "")
+        for i, (_, f, _, _) in enumerate(parts)
+    )
+    args = "".join(f"{f}, " for f in dict.fromkeys(fields))
+    sig = f"*, {args}**_" if args else "**_"
+    return eval(f"lambda {sig}: f'{body}'", {"_L": tuple(lit for lit, _, _, _ in parts)})
+
+
+_JINJA_VAR_RE = re.compile(r"\{\{\s*([A-Za-z_]\w*)\s*\}\}")
+
+if _jinja_available:
+    _JINJA_ENV = jinja2.Environment(
+        autoescape=False,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        keep_trailing_newline=True,
+        undefined=jinja2.StrictUndefined,
+    )
+
+
+def compile_template(source: str) -> Callable[..., str]:
+    """
+    Compile a Jinja2 template once at import. Without jinja2 installed, plain
+    {{ var }} templates are translated to the f-string compiler above.
+    """
+    if _jinja_available:
+        return _JINJA_ENV.from_string(source).render
+    if "{%" in source or "{#" in source:
+        raise RuntimeError("jinja2 is required for templates with control blocks")
+    pieces = _JINJA_VAR_RE.split(source)
+    # split() alternates literal text and captured variable names
+    fmt = "".join(
+        "{%s}" % piece if i % 2 else piece.replace("{", "{{").replace("}", "}}")
+        for i, piece in enumerate(pieces)
+    )
+    return compile_prompt(fmt)
+
+
+def load_template(name: str) -> Callable[..., str]:
+    """Read and compile a template from agents/templates/"""
+    return compile_template(_read_template(name))
+
+
+render_email_summary = compile_prompt(EMAIL_SUMMARY_PROMPT)
+render_email_actions = compile_prompt(EMAIL_ACTIONS_PROMPT)
+render_email_reply = compile_prompt(EMAIL_REPLY_PROMPT)
+render_mom = compile_template(MOM_PROMPT)
+render_nudge = compile_prompt(NUDGE_PROMPT)
+render_eod = compile_template(EOD_PROMPT)
+render_wellness_analysis = compile_prompt(WELLNESS_ANALYSIS_PROMPT)
+render_burnout_detection = compile_prompt(BURNOUT_DETECTION_PROMPT)
+render_break_suggestion = compile_prompt(BREAK_SUGGESTION_PROMPT)
+render_focus_plan = compile_prompt(FOCUS_PLAN_PROMPT)
+render_meeting_detox = compile_prompt(MEETING_DETOX_PROMPT)
+render_mood_response = compile_prompt(MOOD_RESPONSE_PROMPT)
+render_celebration = compile_prompt(CELEBRATION_PROMPT)
+
+PROMPT_FNS: Dict[str, Callable[..., str]] = {
+    "email_summary": render_email_summary,
+    "email_actions": render_email_actions,
+    "email_reply": render_email_reply,
+    "mom": render_mom,
+    "nudge": render_nudge,
+    "eod": render_eod,
+    "wellness_analysis": render_wellness_analysis,
+    "burnout_detection": render_burnout_detection,
+    "break_suggestion": render_break_suggestion,
+    "focus_plan": render_focus_plan,
+    "meeting_detox": render_meeting_detox,
+    "mood_response": render_mood_response,
+    "celebration": render_celebration,
+}
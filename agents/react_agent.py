@@ -14,31 +14,62 @@ This is TRUE agentic AI - the agent autonomously decides its next action.
 """
 
 from __future__ import annotations
-from typing import Dict, Any, List, Optional, Generator, Callable
+from typing import Dict, Any, List, Optional, Generator, AsyncGenerator, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
+from enum import IntEnum
+from array import array
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
 import json
+import os
+import re
+import sys
+import time
 import uuid
 
-from agents.tools import TOOLS, ToolExecutor, get_tools_for_llm, get_approval_required_tools
+try:
+    import orjson
+    _orjson_available = True
+except ImportError:
+    _orjson_available = False
+
+from agents.tools import TOOLS, ToolExecutor, get_approval_required_tools, tools_version
+from agents.prompts import compile_prompt
+from agents.prompt_cache import cache_get, cache_put, cached_call
 
 
 # ============================================================
 # DATA STRUCTURES
 # ============================================================
 
-class StepType(Enum):
-    THINK = "think"
-    ACT = "act"
-    OBSERVE = "observe"
-    FINISH = "finish"
-    AWAIT_APPROVAL = "await_approval"
-    AWAIT_INPUT = "await_input"
-    ERROR = "error"
+class StepType(IntEnum):
+    THINK = 0
+    ACT = 1
+    OBSERVE = 2
+    FINISH = 3
+    AWAIT_APPROVAL = 4
+    AWAIT_INPUT = 5
+    ERROR = 6
 
+    @property
+    def label(self) -> str:
+        """Serialized name ("think", "act", ...)"""
+        return STEP_NAMES[self]
 
-@dataclass
+
+# Wire names, indexed by StepType
+STEP_NAMES = ("think", "act", "observe", "finish", "await_approval", "await_input", "error")
+
+
+def _iso_from_ns(ns: int) -> str:
+    return datetime.utcfromtimestamp(ns / 1e9).isoformat()
+
+
+@dataclass(slots=True)
 class ReasoningStep:
     """A single step in the agent's reasoning process"""
     step_type: StepType
@@ -46,8 +77,156 @@ class ReasoningStep:
     tool_name: Optional[str] = None
     tool_params: Optional[Dict[str, Any]] = None
     tool_result: Optional[Dict[str, Any]] = None
-    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp_ns: int = field(default_factory=time.time_ns)
     iteration: int = 0
+    partial: bool = False  # in-progress THINK text while the response streams
+    tool_calls: Optional[List[tuple]] = None  # THINK only: (tool, params) batch when the LLM asked for several
+    
+    @property
+    def timestamp(self) -> str:
+        """UTC ISO string, formatted on demand rather than at construction"""
+        return _iso_from_ns(self.timestamp_ns)
+    
+    def __post_init__(self):
+        # Tool names come fresh out of parsed LLM JSON; interning collapses the
+        # handful of distinct names across a trace and makes TOOLS lookups identity hits.
+        # Only registered names: hallucinated ones would just grow the intern table
+        if type(self.tool_name) is str and self.tool_name in TOOLS:
+            self.tool_name = sys.intern(self.tool_name)
+
+
+# Step types stored as their ints in the trace; names resolved only on serialize
+_STEP_TYPES = tuple(StepType)
+
+
+# Steps shown under "Recent Steps" in the THINK prompt, and their content cut-off
+RECENT_STEPS = 5
+RECENT_STEP_CHARS = 200
+
+
+def _summary_line(step_type: int, content: str) -> str:
+    if len(content) > RECENT_STEP_CHARS:
+        return f"[{STEP_NAMES[step_type]}] {content[:RECENT_STEP_CHARS]}..."
+    return f"[{STEP_NAMES[step_type]}] {content}"
+
+
+class TraceBuffer:
+    """
+    Column-oriented reasoning trace.
+    
+    Steps are stored as parallel columns rather than one object per step, so
+    appends are a handful of list pushes and serialization is a single pass.
+    With max_steps set, only the newest max_steps steps are kept. The prompt's
+    "Recent Steps" lines are formatted once, at append time.
+    """
+    
+    __slots__ = ("step_types", "contents", "tool_names", "tool_params",
+                 "tool_results", "timestamps_ns", "iterations", "max_steps", "recent_lines")
+    
+    def __init__(self, max_steps: Optional[int] = None):
+        self.max_steps = max_steps
+        self.recent_lines: deque = deque(maxlen=RECENT_STEPS)
+        self.step_types = array("b")
+        self.contents: List[str] = []
+        self.tool_names: List[Optional[str]] = []
+        self.tool_params: List[Optional[Dict[str, Any]]] = []
+        self.tool_results: List[Optional[Dict[str, Any]]] = []
+        self.timestamps_ns = array("q")
+        self.iterations = array("i")
+    
+    def append(self, step: ReasoningStep) -> None:
+        self.step_types.append(step.step_type)
+        self.contents.append(step.content)
+        self.tool_names.append(step.tool_name)
+        self.tool_params.append(step.tool_params)
+        self.tool_results.append(step.tool_result)
+        self.timestamps_ns.append(step.timestamp_ns)
+        self.iterations.append(step.iteration)
+        self.recent_lines.append(_summary_line(step.step_type, step.content))
+        if self.max_steps is not None and len(self.contents) > self.max_steps:
+            self._drop_oldest(len(self.contents) - self.max_steps)
+    
+    def _drop_oldest(self, n: int) -> None:
+        for column in (self.step_types, self.contents, self.tool_names, self.tool_params,
+                       self.tool_results, self.timestamps_ns, self.iterations):
+            del column[:n]
+    
+    def __len__(self) -> int:
+        return len(self.contents)
+    
+    def __iter__(self):
+        """Rebuild ReasoningStep views for callers that want row objects"""
+        for i in range(len(self.contents)):
+            yield ReasoningStep(
+                step_type=_STEP_TYPES[self.step_types[i]],
+                content=self.contents[i],
+                tool_name=self.tool_names[i],
+                tool_params=self.tool_params[i],
+                tool_result=self.tool_results[i],
+                timestamp_ns=self.timestamps_ns[i],
+                iteration=self.iterations[i]
+            )
+    
+    def recent(self, n: int) -> List[tuple]:
+        """Last n steps as (step type name, content) pairs"""
+        names = STEP_NAMES
+        return [(names[t], c) for t, c in zip(self.step_types[-n:], self.contents[-n:])]
+    
+    def to_columns(self) -> Dict[str, List[Any]]:
+        names, iso = STEP_NAMES, _iso_from_ns
+        return {
+            "step_types": [names[t] for t in self.step_types],
+            "contents": self.contents,
+            "tool_names": self.tool_names,
+            "tool_params": self.tool_params,
+            "tool_results": self.tool_results,
+            "timestamps": [iso(ns) for ns in self.timestamps_ns],
+            "iterations": self.iterations.tolist()
+        }
+    
+    def to_rows(self) -> List[Dict[str, Any]]:
+        cols = self.to_columns()
+        return [
+            {
+                "step_type": t,
+                "content": c,
+                "tool_name": n,
+                "tool_params": p,
+                "tool_result": r,
+                "timestamp": ts,
+                "iteration": it
+            }
+            for t, c, n, p, r, ts, it in zip(
+                cols["step_types"], cols["contents"], cols["tool_names"], cols["tool_params"],
+                cols["tool_results"], cols["timestamps"], cols["iterations"]
+            )
+        ]
+
+
+class _LazyContainer:
+    """
+    Dataclass field default that allocates its container on first access.
+    Short runs that never touch approvals / memo / prefetch never build them.
+    """
+    
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+    
+    def __set_name__(self, owner, name):
+        self.attr = "_lazy_" + name
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self  # dataclass reads this as the field default
+        try:
+            return obj.__dict__[self.attr]
+        except KeyError:
+            value = obj.__dict__[self.attr] = self.factory()
+            return value
+    
+    def __set__(self, obj, value):
+        if value is not self:  # __init__ passing the default back: stay unallocated
+            obj.__dict__[self.attr] = value
 
 
 @dataclass
@@ -55,51 +234,84 @@ class AgentState:
     """Current state of the agent during execution"""
     goal: str
     email: Optional[Dict[str, Any]] = None
-    context_gathered: Dict[str, Any] = field(default_factory=dict)
-    actions_taken: List[str] = field(default_factory=list)
-    pending_approvals: List[Dict[str, Any]] = field(default_factory=list)
-    reasoning_trace: List[ReasoningStep] = field(default_factory=list)
+    context_gathered: Dict[str, Any] = _LazyContainer(dict)
+    actions_taken: List[str] = _LazyContainer(list)
+    actions_taken_set: set = _LazyContainer(set)  # membership view of actions_taken
+    pending_approvals: List[Dict[str, Any]] = _LazyContainer(list)
+    reasoning_trace: TraceBuffer = field(default_factory=TraceBuffer)
+    tool_memo: Dict[str, Dict[str, Any]] = _LazyContainer(dict)  # call key -> read-only tool result
+    memo_hits: int = 0
+    prefetched: set = _LazyContainer(set)  # memo keys filled by prefetch, not yet used
     iteration: int = 0
     max_iterations: int = 10
     status: str = "running"  # running, completed, awaiting_approval, awaiting_input, error
     final_summary: Optional[str] = None
+    prompt_head: Optional[str] = None  # per-email prompt block, rendered on the first THINK
+    _actions_joined: Optional[str] = field(default=None, init=False, repr=False)
     
-    def to_dict(self) -> Dict[str, Any]:
+    def record_action(self, action: str) -> None:
+        """Append to actions_taken, keeping the set view and joined text in step"""
+        self.actions_taken.append(action)
+        self.actions_taken_set.add(action)
+        self._actions_joined = None
+    
+    def actions_joined(self) -> str:
+        """", ".join(actions_taken), rebuilt only after a new action is recorded"""
+        if self._actions_joined is None:
+            self._actions_joined = ", ".join(self.actions_taken)
+        return self._actions_joined
+    
+    def _payload(self, trace: Any) -> Dict[str, Any]:
         return {
             "goal": self.goal,
             "email": self.email,
             "context_gathered": self.context_gathered,
             "actions_taken": self.actions_taken,
             "pending_approvals": self.pending_approvals,
-            "reasoning_trace": [
-                {
-                    "step_type": step.step_type.value,
-                    "content": step.content,
-                    "tool_name": step.tool_name,
-                    "tool_params": step.tool_params,
-                    "tool_result": step.tool_result,
-                    "timestamp": step.timestamp,
-                    "iteration": step.iteration
-                }
-                for step in self.reasoning_trace
-            ],
+            "reasoning_trace": trace,
+            "tool_memo_hits": self.memo_hits,
             "iteration": self.iteration,
             "status": self.status,
             "final_summary": self.final_summary
         }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return self._payload(self.reasoning_trace.to_rows())
+    
+    def to_json_bytes(self) -> bytes:
+        """
+        Wire form, encoded straight from the state: the trace stays columnar and
+        is expanded by the encoder's default hook, so no row dicts are built.
+        """
+        payload = self._payload(self.reasoning_trace)
+        if _orjson_available:
+            return orjson.dumps(payload, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(payload, default=_json_default, ensure_ascii=False).encode("utf-8")
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, TraceBuffer):
+        return obj.to_columns()
+    if isinstance(obj, array):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
 
 
 # ============================================================
 # PROMPTS FOR AGENT REASONING
 # ============================================================
 
-REACT_SYSTEM_PROMPT = """You are an intelligent workplace assistant agent using the ReAct (Reasoning + Acting) framework.
+# The prompt is split so everything static comes first: providers cache on the
+# longest shared prefix, and per-iteration state at the top would defeat that.
+REACT_SYSTEM_PREFIX_TEMPLATE = """You are an intelligent workplace assistant agent using the ReAct (Reasoning + Acting) framework.
 
 Your task is to autonomously process workplace items (emails, tasks, meetings) and take appropriate actions.
 
 ## How You Work:
 1. THINK: Analyze the situation, what you know, what you need to find out
-2. ACT: Choose ONE tool to execute (or finish if done)
+2. ACT: Choose ONE tool to execute (or finish if done), or several independent read/search tools at once
 3. OBSERVE: I'll show you the result
 4. REPEAT: Continue until the task is complete
 
@@ -109,12 +321,6 @@ Your task is to autonomously process workplace items (emails, tasks, meetings) a
 ## Tools Requiring Approval:
 These actions will be queued for human review: {approval_tools}
 
-## Current State:
-- Goal: {goal}
-- Iteration: {iteration}/{max_iterations}
-- Actions taken so far: {actions_taken}
-- Context gathered: {context_summary}
-
 ## Rules:
 1. Always THINK before acting - explain your reasoning
 2. Be efficient - don't repeat searches unnecessarily
@@ -123,6 +329,8 @@ These actions will be queued for human review: {approval_tools}
 5. Use find_related_context when you need more information
 6. Call 'finish' when you've completed all necessary actions
 7. If you're unsure, use 'request_human_input'
+8. When you need several lookups that don't depend on each other, list them all in "actions" (read/search/analyze tools only)
+9. A failed tool call is followed by its schema: "params" maps each parameter to {{"t": type (s=string, i=integer, b=boolean, a=array, o=object), "d": description, "e": allowed values}}; "req" lists the required ones
 
 Respond with a JSON object:
 {{
@@ -131,6 +339,15 @@ Respond with a JSON object:
     "action_input": {{ tool parameters }}
 }}
 
+Or, for independent lookups in one step:
+{{
+    "thought": "Your reasoning",
+    "actions": [
+        {{"action": "tool_name", "action_input": {{ tool parameters }}}},
+        {{"action": "tool_name", "action_input": {{ tool parameters }}}}
+    ]
+}}
+
 Or if you're done:
 {{
     "thought": "Summary of what was accomplished",
@@ -143,6 +360,41 @@ Or if you're done:
 }}
 """
 
+REACT_STATE_SUFFIX = """
+## Current State:
+- Iteration: {iteration}/{max_iterations}
+- Actions taken so far: {actions_taken}
+- Context gathered: {context_summary}
+"""
+
+
+def _render_react_system_prefix() -> str:
+    """Render the static prefix; tool tables only change when TOOLS does"""
+    return REACT_SYSTEM_PREFIX_TEMPLATE.format(
+        tools_description="\n".join(f"- {name}: {tool.description}" for name, tool in TOOLS.items()),
+        approval_tools=", ".join(get_approval_required_tools())
+    )
+
+
+REACT_SYSTEM_PREFIX = _render_react_system_prefix()
+_prefix_cache = (tools_version(), REACT_SYSTEM_PREFIX)
+
+
+def react_system_prefix() -> str:
+    """Rendered prefix, re-rendered only if a tool was registered since the last call"""
+    global _prefix_cache
+    version = tools_version()
+    if _prefix_cache[0] != version:
+        _prefix_cache = (version, _render_react_system_prefix())
+    return _prefix_cache[1]
+
+# Per-email block between the prefix and the state: identical on every
+# iteration for one email, so the provider's prefix cache covers it too
+REACT_GOAL_HEAD = """
+## Goal:
+{goal}
+"""
+
 INITIAL_ANALYSIS_PROMPT = """Analyze this email and decide how to handle it:
 
 **From:** {from_email}
@@ -157,10 +409,297 @@ Think step by step:
 3. Is this urgent? What's the deadline?
 4. What context do I need to gather?
 5. What actions should I take?
-
-Start by deciding your first action.
 """
 
+# Email body preview length in the per-email head
+INITIAL_BODY_CHARS = 2000
+
+render_react_goal = compile_prompt(REACT_GOAL_HEAD)
+render_react_state = compile_prompt(REACT_STATE_SUFFIX)
+render_initial_analysis = compile_prompt(INITIAL_ANALYSIS_PROMPT)
+
+
+# ============================================================
+# RESPONSE PARSING
+# ============================================================
+
+# orjson parses str directly (no encode round-trip) and is several times faster
+# than json on LLM-sized replies; both raise ValueError subclasses on bad input
+_loads = orjson.loads if _orjson_available else json.loads
+
+# Used by _parse_llm_response on every LLM reply
+_FENCE_RE = re.compile(r'```(?:json)?(.*?)(?:```|$)', re.S)
+_LINE_COMMENT_RE = re.compile(r'//.*?(?=\n|$)')
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+_ACTION_RE = re.compile(r'"action"\s*:\s*"([^"]+)"')
+_QUERY_RE = re.compile(r'"query"\s*:\s*"([^"]+)"')
+
+_THOUGHT_START_RE = re.compile(r'"thought"\s*:\s*"')
+PARTIAL_THOUGHT_MIN_CHARS = 40
+
+
+def _partial_thought(buf: str) -> Optional[str]:
+    """Decoded (possibly unfinished) "thought" string value from a partial JSON buffer"""
+    m = _THOUGHT_START_RE.search(buf)
+    if not m:
+        return None
+    start = i = m.end()
+    n = len(buf)
+    while i < n:
+        c = buf[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == '"':
+            break
+        i += 1
+    raw = buf[start:min(i, n)]
+    while True:
+        try:
+            return json.loads('"' + raw + '"')
+        except ValueError:
+            # Cut mid-escape: drop the unfinished escape and retry
+            cut = raw.rfind("\\")
+            if cut < 0:
+                return raw
+            raw = raw[:cut]
+
+
+# ============================================================
+# PER-RUN TOOL MEMO AND SPECULATIVE PREFETCH
+# ============================================================
+
+# Side-effect-free tools; repeating one of these within a run returns the earlier result
+_MEMO_CATEGORIES = frozenset(("read", "search", "analyze"))
+
+
+def _memoizable(tool_name: str) -> bool:
+    tool = TOOLS.get(tool_name)
+    return tool is not None and not tool.requires_approval and tool.category in _MEMO_CATEGORIES
+
+
+def _call_key(tool_name: str, params: Optional[Dict[str, Any]]) -> str:
+    canonical = json.dumps(params or {}, sort_keys=True, default=str)
+    return hashlib.blake2b(f"{tool_name}\x00{canonical}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _decision_calls(decision: Dict[str, Any]) -> List[tuple]:
+    """(tool, params) pairs from a decision: the "actions" batch if given, else the single action"""
+    batch = decision.get("actions")
+    if isinstance(batch, list):
+        calls = [(c["action"], c.get("action_input") or {})
+                 for c in batch if isinstance(c, dict) and c.get("action")]
+        if calls:
+            return calls
+    if decision.get("action"):
+        return [(decision["action"], decision.get("action_input", {}))]
+    return []
+
+
+def _parallel_safe(calls: List[tuple]) -> bool:
+    """Only side-effect-free reads fan out; writes, approvals and finish stay one per step"""
+    return all(_memoizable(name) for name, _ in calls)
+
+
+def _after_search_meetings(result: Dict[str, Any], params: Dict[str, Any]):
+    meetings = result.get("meetings") or []
+    if meetings and meetings[0].get("has_transcript"):
+        return "get_meeting_transcript", {"meeting_id": meetings[0]["meeting_id"]}, 0.75
+    return None
+
+
+def _after_get_meeting_transcript(result: Dict[str, Any], params: Dict[str, Any]):
+    if result.get("has_transcript") and params.get("meeting_id"):
+        return "get_meeting_mom", {"meeting_id": params["meeting_id"]}, 0.72
+    return None
+
+
+class PrefetchPredictor:
+    """
+    Guesses the next tool call from the last action's result. Only read-only
+    follow-ups whose parameters come straight from that result (ids) are
+    predicted, so a correct guess matches the model's call exactly.
+    """
+    
+    THRESHOLD = 0.7
+    
+    _RULES = {
+        "search_meetings": _after_search_meetings,
+        "get_meeting_transcript": _after_get_meeting_transcript,
+    }
+    
+    def predict(self, act_step: Optional[ReasoningStep]) -> Optional[tuple]:
+        """Return (tool_name, params) when confident enough, else None"""
+        if act_step is None or act_step.step_type != StepType.ACT:
+            return None
+        rule = self._RULES.get(act_step.tool_name)
+        result = act_step.tool_result or {}
+        if rule is None or not result.get("success", True) or result.get("requires_approval"):
+            return None
+        guess = rule(result.get("result") or {}, act_step.tool_params or {})
+        if guess is None:
+            return None
+        tool_name, params, confidence = guess
+        tool = TOOLS.get(tool_name)
+        if confidence <= self.THRESHOLD or tool is None or tool.requires_approval:
+            return None
+        return tool_name, params
+
+
+# ============================================================
+# SIMULATION KEYWORD SCANS
+# ============================================================
+
+def _keyword_re(words) -> "re.Pattern":
+    """Single compiled alternation: one C-level pass over the text for every keyword"""
+    return re.compile("|".join(re.escape(w) for w in sorted(words, key=len, reverse=True)))
+
+
+URGENCY_KEYWORDS = ("urgent", "asap", "immediately", "critical", "blocker")
+DEADLINE_KEYWORDS = ("by eod", "by end of", "deadline", "due date", "by tomorrow")
+# In priority order: the first one present becomes the search topic
+TOPIC_KEYWORDS = ("acme", "techvision", "globaltech", "api", "migration", "deadline", "urgent")
+
+_URGENCY_RE = _keyword_re(URGENCY_KEYWORDS)
+_DEADLINE_RE = _keyword_re(DEADLINE_KEYWORDS)
+_TOPIC_RE = _keyword_re(TOPIC_KEYWORDS)
+
+
+def _topic_keywords(text: str) -> List[str]:
+    """TOPIC_KEYWORDS found in (lowercased) text, in priority order"""
+    found = set(_TOPIC_RE.findall(text))
+    return [w for w in TOPIC_KEYWORDS if w in found]
+
+
+def preclassify_emails(emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Keyword flags for a whole corpus at once: {"urgent", "deadline", "topics"}
+    per email, in input order. All subjects and bodies are lowercased into one
+    NUL-separated buffer and each keyword pattern runs over it in a single pass;
+    matches are mapped back to their email by offset.
+    """
+    parts: List[str] = []
+    subject_starts: List[int] = []
+    body_starts: List[int] = []
+    pos = 0
+    for email in emails:
+        subject = (email.get("subject") or "").lower()
+        body = (email.get("body_text") or "").lower()
+        subject_starts.append(pos)
+        body_starts.append(pos + len(subject) + 1)
+        parts.extend((subject, "\x00", body, "\x00"))
+        pos += len(subject) + len(body) + 2
+    text = "".join(parts)
+    
+    flags = [{"urgent": False, "deadline": False, "topics": set()} for _ in emails]
+    for m in _URGENCY_RE.finditer(text):
+        flags[bisect_right(subject_starts, m.start()) - 1]["urgent"] = True
+    for m in _DEADLINE_RE.finditer(text):
+        i = bisect_right(subject_starts, m.start()) - 1
+        if m.start() >= body_starts[i]:  # deadline phrases only count in the body
+            flags[i]["deadline"] = True
+    for m in _TOPIC_RE.finditer(text):
+        flags[bisect_right(subject_starts, m.start()) - 1]["topics"].add(m.group())
+    for f in flags:
+        f["topics"] = [w for w in TOPIC_KEYWORDS if w in f["topics"]]
+    return flags
+
+
+# ============================================================
+# OBSERVATION HANDLERS
+# ============================================================
+
+# Search results are kept in context as ids only; the full payload stays on the ACT step
+CONTEXT_TOP_IDS = 5
+_ID_FIELDS = {"emails": "email_id", "tasks": "task_id", "meetings": "meeting_id"}
+
+
+def _top_ids(kind: str, items: List[Dict[str, Any]]) -> List[Any]:
+    id_field = _ID_FIELDS.get(kind)
+    return [item.get(id_field) for item in items[:CONTEXT_TOP_IDS] if isinstance(item, dict)]
+
+
+def _project_search(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact {success, count, <kind>: [top ids]} view of a search-style tool result"""
+    inner = result.get("result") or {}
+    projection: Dict[str, Any] = {"success": result.get("success", True)}
+    if "error" in result:
+        projection["error"] = result["error"]
+    related = inner.get("related")
+    if isinstance(related, dict):
+        projection["count"] = sum(len(items) for items in related.values())
+        projection["related"] = {kind: _top_ids(kind, items) for kind, items in related.items()}
+        return projection
+    projection["count"] = inner.get("count", 0)
+    for kind in _ID_FIELDS:
+        items = inner.get(kind)
+        if items:
+            projection[kind] = _top_ids(kind, items)
+    return projection
+
+
+def _append_to(key: str) -> Callable[[Dict[str, Any], Dict[str, Any]], None]:
+    def update(context: Dict[str, Any], result: Dict[str, Any]) -> None:
+        context.setdefault(key, []).append(_project_search(result))
+    return update
+
+
+def _store_as(key: str) -> Callable[[Dict[str, Any], Dict[str, Any]], None]:
+    def update(context: Dict[str, Any], result: Dict[str, Any]) -> None:
+        context[key] = result
+    return update
+
+
+# tool name -> how its result is filed into AgentState.context_gathered
+_CONTEXT_UPDATERS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], None]] = {
+    "search_emails": _append_to("search_emails_results"),
+    "search_tasks": _append_to("search_tasks_results"),
+    "search_meetings": _append_to("search_meetings_results"),
+    "find_related_context": _append_to("find_related_context_results"),
+    "get_meeting_transcript": _store_as("transcript"),
+    "get_meeting_mom": _store_as("mom"),
+    "analyze_email": _store_as("email_analysis"),
+}
+
+
+def _found_count(noun: str) -> Callable[[Dict[str, Any]], str]:
+    return lambda result: f"Found {result.get('result', {}).get('count', 0)} related {noun}"
+
+
+def _format_related(result: Dict[str, Any]) -> str:
+    related = result.get("result", {}).get("related", {})
+    summary = ", ".join([f"{k}: {len(v)}" for k, v in related.items()])
+    return f"Context found: {summary}"
+
+
+def _format_task_created(result: Dict[str, Any]) -> str:
+    task = result.get("result", {}).get("task", {})
+    return f"Task created: {task.get('title', 'Unknown')[:50]} ({task.get('priority', '?')})"
+
+
+# tool name -> one-line OBSERVE text for a successful result
+_OBSERVATION_FORMATTERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "search_emails": _found_count("emails"),
+    "search_tasks": _found_count("tasks"),
+    "search_meetings": _found_count("meetings"),
+    "find_related_context": _format_related,
+    "get_meeting_transcript": lambda result: f"Transcript {'retrieved' if result.get('result', {}).get('has_transcript', False) else 'not available'}",
+    "get_meeting_mom": lambda result: f"Meeting minutes {'found' if result.get('result', {}).get('found', False) else 'not found'}",
+    "create_task": _format_task_created,
+    "draft_email_reply": lambda result: "Email reply drafted (pending approval)",
+    "think": lambda result: "Thought recorded",
+}
+
+
+# Longest exception message carried into a fallback decision's text
+ERROR_TEXT_CHARS = 300
+
+# Newest reasoning steps kept per run: a full 10-iteration single-tool run fits
+TRACE_LIMIT = 32
+
+# Emails per lock-step batch in process_emails_batch
+BATCH_SIZE = int(os.getenv("REACT_BATCH_SIZE", "16"))
+
 
 # ============================================================
 # REACT AGENT CLASS
@@ -183,7 +722,11 @@ class ReActAgent:
         gateway=None,
         user_email: str = "kowshik.naidu@contoso.com",
         max_iterations: int = 10,
-        auto_approve_reads: bool = True
+        auto_approve_reads: bool = True,
+        prefetch: bool = True,
+        stream_thoughts: bool = False,
+        cache_decisions: bool = True,
+        trace_limit: Optional[int] = TRACE_LIMIT
     ):
         self.repo = repo
         self.gateway = gateway
@@ -191,84 +734,271 @@ class ReActAgent:
         self.max_iterations = max_iterations
         self.auto_approve_reads = auto_approve_reads
         self.tool_executor = ToolExecutor(repo, gateway, user_email)
+        # Prefetch only pays off while a real LLM call is in flight
+        self.prefetch = prefetch
+        self._predictor = PrefetchPredictor()
+        # Shared by prefetch and batched tool calls; created on first use
+        self.tool_concurrency = int(os.getenv("TOOL_CONCURRENCY_LIMIT", "4"))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # email_id -> keyword flags from bulk_preclassify (simulation mode)
+        self._preclassified: Dict[str, Dict[str, Any]] = {}
+        # Yield partial THINK steps (partial=True) while the response streams in
+        self.stream_thoughts = stream_thoughts
+        # Reuse the parsed decision when the exact same THINK prompt comes round again
+        self.cache_decisions = cache_decisions
+        # Steps kept in each run's reasoning_trace; None keeps the whole run (debugging)
+        self.trace_limit = trace_limit
+    
+    def reset(self) -> None:
+        """Drop per-run bookkeeping so the agent can be reused for the next email"""
+        self.tool_executor._execution_log.clear()
+        self._preclassified.clear()
     
-    def process_email(self, email: Dict[str, Any]) -> Generator[ReasoningStep, None, AgentState]:
+    def close(self) -> None:
+        """Shut down the tool pool; it is recreated if the agent is used again"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+    
+    def process_email(self, email: Dict[str, Any], announce: bool = True) -> Generator[ReasoningStep, None, AgentState]:
         """
         Process an email autonomously using ReAct loop.
         
         Yields ReasoningStep objects as the agent thinks and acts.
         Returns the final AgentState when complete.
+        announce=False skips the iteration-0 "New Email Received" step, for
+        callers that discard the steps and only want the final state.
         """
         # Initialize state
-        state = AgentState(
-            goal=f"Process email from {email.get('from_email', 'unknown')}: {email.get('subject', 'No subject')}",
-            email=email,
-            max_iterations=self.max_iterations
-        )
+        state = self._new_state(email)
         
-        # Initial thinking
-        initial_thought = self._format_initial_analysis(email)
-        yield ReasoningStep(
-            step_type=StepType.THINK,
-            content=initial_thought,
-            iteration=0
-        )
+        # Initial thinking (display only; never part of the trace)
+        if announce:
+            yield ReasoningStep(
+                step_type=StepType.THINK,
+                content=self._format_initial_analysis(email),
+                iteration=0
+            )
         
         # ReAct Loop
+        act_step = None
         while state.iteration < state.max_iterations and state.status == "running":
             state.iteration += 1
             
-            # THINK: Decide what to do next
-            think_step = self._think(state)
-            state.reasoning_trace.append(think_step)
-            yield think_step
+            # THINK: Decide what to do next (prefetching the likely next read meanwhile)
+            if self.stream_thoughts and hasattr(self.gateway, "stream_llm"):
+                think_step = yield from self._think_streaming(state, act_step)
+            else:
+                think_step = self._think(state, act_step)
             
+            act_step = yield from self._run_iteration(state, think_step)
+        
+        # Max iterations reached
+        finish_step = self._finish_if_exhausted(state)
+        if finish_step is not None:
+            yield finish_step
+        
+        return state
+    
+    async def aprocess_email(self, email: Dict[str, Any], announce: bool = True) -> AsyncGenerator[ReasoningStep, None]:
+        """
+        Async form of process_email for event-loop servers. Each blocking stretch
+        (LLM call, tool execution) runs in a worker thread, so many emails can be
+        in flight on one loop. Use one agent per concurrent email; the final
+        state is available via aprocess_email_sync.
+        """
+        gen = self.process_email(email, announce)
+        while True:
+            step, _ = await asyncio.to_thread(_advance, gen)
+            if step is None:
+                return
+            yield step
+    
+    def process_emails_batch(self, emails: List[Dict[str, Any]],
+                             batch_size: int = BATCH_SIZE) -> List[AgentState]:
+        """
+        Process several independent emails in lock-step. Each iteration's THINK
+        prompts for the still-running emails go to the gateway as one batch, so
+        the model server sees them together and shares the common prompt prefix.
+        Returns the final states in input order; steps are recorded in each trace.
+        """
+        batched = self.gateway is not None and hasattr(self.gateway, "batch_call_llm")
+        results: List[AgentState] = []
+        for start in range(0, len(emails), batch_size):
+            states = [self._new_state(email) for email in emails[start:start + batch_size]]
+            while True:
+                running = [s for s in states
+                           if s.status == "running" and s.iteration < s.max_iterations]
+                if not running:
+                    break
+                for state in running:
+                    state.iteration += 1
+                if batched:
+                    think_steps = [self._think_step(state, decision)
+                                   for state, decision in zip(running, self._decide_batch(running))]
+                else:
+                    think_steps = [self._think(state) for state in running]
+                for state, think_step in zip(running, think_steps):
+                    for _ in self._run_iteration(state, think_step):
+                        pass
+            for state in states:
+                self._finish_if_exhausted(state)
+            results.extend(states)
+        return results
+    
+    def bulk_preclassify(self, emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Scan a corpus's keywords up front (see preclassify_emails). Simulation
+        runs over these emails then read the flags instead of rescanning.
+        """
+        flags = preclassify_emails(emails)
+        for email, f in zip(emails, flags):
+            if email.get("email_id"):
+                self._preclassified[email["email_id"]] = f
+        return flags
+    
+    def _new_state(self, email: Dict[str, Any]) -> AgentState:
+        return AgentState(
+            goal=f"Process email from {email.get('from_email', 'unknown')}: {email.get('subject', 'No subject')}",
+            email=email,
+            max_iterations=self.max_iterations,
+            reasoning_trace=TraceBuffer(self.trace_limit)
+        )
+    
+    def _run_iteration(self, state: AgentState, think_step: ReasoningStep) -> Generator[ReasoningStep, None, Optional[ReasoningStep]]:
+        """Record and yield the THINK step, then act on it. Returns the last ACT step, if any"""
+        state.reasoning_trace.append(think_step)
+        yield think_step
+        
+        calls = think_step.tool_calls or [(think_step.tool_name, think_step.tool_params)]
+        
+        # ACT: an independent batch of reads runs concurrently
+        if len(calls) > 1 and _parallel_safe(calls):
+            act_steps = self._act_batch(state, calls)
+            for act_step in act_steps:
+                yield from self._record_act(state, act_step)
+            return act_steps[-1]
+        
+        # Otherwise every call runs in the order listed, one at a time
+        last_act = None
+        for tool_name, tool_params in calls:
             # Check if agent decided to finish
-            if think_step.tool_name == "finish":
+            if tool_name == "finish":
                 state.status = "completed"
-                state.final_summary = think_step.tool_params.get("summary", "Task completed")
-                break
+                state.final_summary = tool_params.get("summary", "Task completed")
+                return last_act
             
             # Check if agent needs human input
-            if think_step.tool_name == "request_human_input":
+            if tool_name == "request_human_input":
                 state.status = "awaiting_input"
-                break
-            
-            # ACT: Execute the chosen tool
-            act_step = self._act(state, think_step.tool_name, think_step.tool_params)
-            state.reasoning_trace.append(act_step)
-            yield act_step
+                return last_act
             
-            # Handle actions requiring approval
-            if act_step.tool_result and act_step.tool_result.get("requires_approval"):
-                state.pending_approvals.append({
-                    "tool": think_step.tool_name,
-                    "params": think_step.tool_params,
-                    "result": act_step.tool_result,
-                    "iteration": state.iteration
-                })
-                state.actions_taken.append(f"{think_step.tool_name} (pending approval)")
-            else:
-                state.actions_taken.append(think_step.tool_name)
-            
-            # OBSERVE: Process the result and update context
-            observe_step = self._observe(state, act_step)
-            state.reasoning_trace.append(observe_step)
-            yield observe_step
+            last_act = self._act(state, tool_name, tool_params)
+            yield from self._record_act(state, last_act)
+        return last_act
+    
+    def _record_act(self, state: AgentState, act_step: ReasoningStep) -> Generator[ReasoningStep, None, None]:
+        """Record and yield an ACT step, then its OBSERVE step"""
+        state.reasoning_trace.append(act_step)
+        yield act_step
         
-        # Max iterations reached
+        # Handle actions requiring approval
+        if act_step.tool_result and act_step.tool_result.get("requires_approval"):
+            state.pending_approvals.append({
+                "tool": act_step.tool_name,
+                "params": act_step.tool_params,
+                "result": act_step.tool_result,
+                "iteration": state.iteration
+            })
+            state.record_action(f"{act_step.tool_name} (pending approval)")
+        else:
+            state.record_action(act_step.tool_name)
+        
+        # OBSERVE: Process the result and update context
+        observe_step = self._observe(state, act_step)
+        state.reasoning_trace.append(observe_step)
+        yield observe_step
+    
+    def _finish_if_exhausted(self, state: AgentState) -> Optional[ReasoningStep]:
+        """Close out a run that used up its iterations; returns the FINISH step"""
         if state.iteration >= state.max_iterations and state.status == "running":
             state.status = "completed"
-            state.final_summary = f"Reached maximum iterations ({state.max_iterations}). Actions taken: {', '.join(state.actions_taken)}"
-            yield ReasoningStep(
+            state.final_summary = f"Reached maximum iterations ({state.max_iterations}). Actions taken: {state.actions_joined()}"
+            return ReasoningStep(
                 step_type=StepType.FINISH,
                 content=state.final_summary,
                 iteration=state.iteration
             )
+        return None
+    
+    def _decide_batch(self, states: List[AgentState]) -> List[Dict[str, Any]]:
+        """Decisions for one lock-step iteration: cache hits first, the rest in one gateway batch"""
+        prompts = [self._build_think_prompt(state) for state in states]
+        decisions: List[Optional[Dict[str, Any]]] = [
+            cache_get("react_think", (prompt,)) if self.cache_decisions else None
+            for prompt in prompts
+        ]
+        misses = [i for i, decision in enumerate(decisions) if decision is None]
+        if not misses:
+            return decisions
         
-        return state
+        try:
+            responses = self.gateway.batch_call_llm(
+                [prompts[i] for i in misses],
+                temperature=0.3,
+                max_tokens=1000,
+                correlation_ids=[(states[i].email or {}).get("correlation_id") for i in misses]
+            )
+        except Exception as e:
+            responses = [e] * len(misses)
+        
+        for i, response in zip(misses, responses):
+            # Failed slots are handled without re-raising (which would grow the shared traceback)
+            if isinstance(response, Exception):
+                decisions[i] = self._fallback_decision(states[i], response)
+                continue
+            try:
+                decision = self._parse_llm_response(response)
+                if self.cache_decisions:
+                    cache_put("react_think", (prompts[i],), decision)
+            except Exception as e:
+                decision = self._fallback_decision(states[i], e)
+            decisions[i] = decision
+        return decisions
     
-    def _think(self, state: AgentState) -> ReasoningStep:
+    def _start_prefetch(self, state: AgentState, last_act: Optional[ReasoningStep]) -> Optional[tuple]:
+        """Kick off the predicted next read so it overlaps the LLM round-trip"""
+        guess = self._predictor.predict(last_act)
+        if guess is None:
+            return None
+        tool_name, params = guess
+        key = _call_key(tool_name, params)
+        if key in state.tool_memo:
+            return None
+        return key, self._get_pool().submit(self.tool_executor.execute, tool_name, params)
+    
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=max(1, self.tool_concurrency),
+                                            thread_name_prefix="react-tools")
+        return self._pool
+    
+    def _settle_prefetch(self, state: AgentState, pending: tuple, decision: Dict[str, Any]) -> None:
+        """Keep the prefetched result if it was wanted (or already done); drop it otherwise"""
+        key, future = pending
+        wanted = any(_call_key(name, params) == key for name, params in _decision_calls(decision))
+        if wanted or future.done():
+            try:
+                result = future.result()
+                if result.get("success"):
+                    state.tool_memo[key] = result
+                    state.prefetched.add(key)
+            except Exception:
+                pass
+        else:
+            future.cancel()
+    
+    def _think(self, state: AgentState, last_act: Optional[ReasoningStep] = None) -> ReasoningStep:
         """Agent thinks about what to do next"""
         
         # Build context for LLM
@@ -276,26 +1006,78 @@ class ReActAgent:
         
         # Call LLM to decide next action
         if self.gateway:
+            pending = self._start_prefetch(state, last_act) if self.prefetch else None
+            correlation_id = state.email.get("correlation_id") if state.email else None
+            decide = lambda: self._parse_llm_response(self.gateway.call_llm(
+                prompt,
+                temperature=0.3,
+                max_tokens=1000,
+                correlation_id=correlation_id
+            ))
             try:
-                response = self.gateway.call_llm(
-                    prompt,
-                    temperature=0.3,
-                    max_tokens=1000,
-                    correlation_id=state.email.get("correlation_id") if state.email else None
-                )
-                decision = self._parse_llm_response(response)
+                # Failures raise out of decide(), so fallback decisions are never cached
+                decision = cached_call("react_think", (prompt,), decide) if self.cache_decisions else decide()
             except Exception as e:
-                decision = self._fallback_decision(state, str(e))
+                decision = self._fallback_decision(state, e)
+            if pending is not None:
+                self._settle_prefetch(state, pending, decision)
         else:
             # Simulation mode - use heuristics
             decision = self._simulate_decision(state)
         
+        return self._think_step(state, decision)
+    
+    def _think_streaming(self, state: AgentState, last_act: Optional[ReasoningStep] = None) -> Generator[ReasoningStep, None, ReasoningStep]:
+        """
+        Like _think, but streams the LLM response and yields partial THINK steps
+        as the "thought" value grows, so a UI can show it before the action is known.
+        Returns the final THINK step.
+        """
+        prompt = self._build_think_prompt(state)
+        # A cached decision needs no stream; the final step is available immediately
+        if self.cache_decisions:
+            decision = cache_get("react_think", (prompt,))
+            if decision is not None:
+                return self._think_step(state, decision)
+        pending = self._start_prefetch(state, last_act) if self.prefetch else None
+        buf = ""
+        shown = 0
+        try:
+            for chunk in self.gateway.stream_llm(
+                prompt,
+                temperature=0.3,
+                max_tokens=1000,
+                correlation_id=state.email.get("correlation_id") if state.email else None
+            ):
+                buf += chunk
+                thought = _partial_thought(buf)
+                if thought and len(thought) - shown >= PARTIAL_THOUGHT_MIN_CHARS:
+                    shown = len(thought)
+                    yield ReasoningStep(
+                        step_type=StepType.THINK,
+                        content=thought,
+                        iteration=state.iteration,
+                        partial=True
+                    )
+            decision = self._parse_llm_response(buf)
+            if self.cache_decisions:
+                cache_put("react_think", (prompt,), decision)
+        except Exception as e:
+            decision = self._fallback_decision(state, e)
+        if pending is not None:
+            self._settle_prefetch(state, pending, decision)
+        return self._think_step(state, decision)
+    
+    def _think_step(self, state: AgentState, decision: Dict[str, Any]) -> ReasoningStep:
+        calls = _decision_calls(decision)
+        tool_name, tool_params = calls[0] if calls else (None, {})
         return ReasoningStep(
             step_type=StepType.THINK,
             content=decision.get("thought", "Analyzing..."),
-            tool_name=decision.get("action"),
-            tool_params=decision.get("action_input", {}),
-            iteration=state.iteration
+            tool_name=tool_name,
+            tool_params=tool_params,
+            iteration=state.iteration,
+            tool_calls=calls if len(calls) > 1 else None
         )
     
     def _act(self, state: AgentState, tool_name: str, params: Dict[str, Any]) -> ReasoningStep:
@@ -309,8 +1091,70 @@ class ReActAgent:
                 iteration=state.iteration
             )
         
-        # Execute the tool
-        result = self.tool_executor.execute(tool_name, params)
+        key = _call_key(tool_name, params) if _memoizable(tool_name) else None
+        reused = self._reuse(state, key, tool_name, params)
+        if reused is not None:
+            return reused
+        return self._act_result(state, key, tool_name, params,
+                                self.tool_executor.execute(tool_name, params))
+    
+    def _act_batch(self, state: AgentState, calls: List[tuple]) -> List[ReasoningStep]:
+        """
+        Run a batch of independent read-only calls on the tool pool.
+        Steps come back in the order the LLM listed the calls; state is only
+        touched here on the calling thread, after the calls complete.
+        """
+        steps: List[Optional[ReasoningStep]] = [None] * len(calls)
+        futures = {}
+        submitted = {}  # call key -> future, so a repeated call in the batch runs once
+        for i, (tool_name, params) in enumerate(calls):
+            key = _call_key(tool_name, params)
+            steps[i] = self._reuse(state, key, tool_name, params)
+            if steps[i] is None:
+                if key not in submitted:
+                    submitted[key] = self._get_pool().submit(self.tool_executor.execute, tool_name, params)
+                futures[i] = (key, submitted[key])
+        
+        for i, (key, future) in futures.items():
+            tool_name, params = calls[i]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            steps[i] = self._act_result(state, key, tool_name, params, result)
+        return steps
+    
+    def _reuse(self, state: AgentState, key: Optional[str], tool_name: str,
+               params: Dict[str, Any]) -> Optional[ReasoningStep]:
+        """ACT step for a read already made (or prefetched) in this run, else None"""
+        cached = state.tool_memo.get(key) if key else None
+        if cached is not None and key in state.prefetched:
+            # First use of a prefetched result: the call happened, just earlier
+            state.prefetched.discard(key)
+            return ReasoningStep(
+                step_type=StepType.ACT,
+                content=f"Executed: {tool_name}",
+                tool_name=tool_name,
+                tool_params=params,
+                tool_result=cached,
+                iteration=state.iteration
+            )
+        if cached is not None:
+            state.memo_hits += 1
+            return ReasoningStep(
+                step_type=StepType.ACT,
+                content=f"Reused earlier result: {tool_name}",
+                tool_name=tool_name,
+                tool_params=params,
+                tool_result={**cached, "cached": True},
+                iteration=state.iteration
+            )
+        return None
+    
+    def _act_result(self, state: AgentState, key: Optional[str], tool_name: str,
+                    params: Dict[str, Any], result: Dict[str, Any]) -> ReasoningStep:
+        if key and result.get("success"):
+            state.tool_memo[key] = result
         
         return ReasoningStep(
             step_type=StepType.ACT,
@@ -327,20 +1171,9 @@ class ReActAgent:
         result = act_step.tool_result or {}
         
         # Update context based on result
-        if act_step.tool_name in ["search_emails", "search_tasks", "search_meetings", "find_related_context"]:
-            key = f"{act_step.tool_name}_results"
-            if key not in state.context_gathered:
-                state.context_gathered[key] = []
-            state.context_gathered[key].append(result)
-        
-        elif act_step.tool_name == "get_meeting_transcript":
-            state.context_gathered["transcript"] = result
-        
-        elif act_step.tool_name == "get_meeting_mom":
-            state.context_gathered["mom"] = result
-        
-        elif act_step.tool_name == "analyze_email":
-            state.context_gathered["email_analysis"] = result
+        update = _CONTEXT_UPDATERS.get(act_step.tool_name)
+        if update is not None:
+            update(state.context_gathered, result)
         
         # Format observation
         if result.get("success", True):
@@ -348,8 +1181,16 @@ class ReActAgent:
                 content = f"Action queued for approval: {act_step.tool_name}"
             else:
                 content = self._format_observation(act_step.tool_name, result)
+                if result.get("cached"):
+                    content += " (reused from earlier in this run)"
         else:
             content = f"Error: {result.get('error', 'Unknown error')}"
+            # The prompt lists tools by name and description only; a failed call
+            # promotes that one tool's compact schema into the observation
+            tool = TOOLS.get(act_step.tool_name)
+            if tool is not None:
+                schema = json.dumps(tool.to_compact_schema(), separators=(",", ":"), ensure_ascii=False)
+                content += f"\nSchema: {schema}"
         
         return ReasoningStep(
             step_type=StepType.OBSERVE,
@@ -360,13 +1201,7 @@ class ReActAgent:
         )
     
     def _build_think_prompt(self, state: AgentState) -> str:
-        """Build the prompt for the thinking step"""
-        
-        # Tool descriptions
-        tools_desc = "\n".join([
-            f"- {name}: {tool.description}"
-            for name, tool in TOOLS.items()
-        ])
+        """Build the prompt for the thinking step: static prefix, per-email head, then volatile state"""
         
         # Context summary
         context_items = []
@@ -381,30 +1216,30 @@ class ReActAgent:
         context_summary = "\n".join(context_items) if context_items else "None yet"
         
         # Recent reasoning
-        recent_steps = state.reasoning_trace[-5:] if state.reasoning_trace else []
-        recent_reasoning = "\n".join([
-            f"[{s.step_type.value}] {s.content[:200]}..."
-            if len(s.content) > 200 else f"[{s.step_type.value}] {s.content}"
-            for s in recent_steps
-        ])
-        
-        prompt = REACT_SYSTEM_PROMPT.format(
-            tools_description=tools_desc,
-            approval_tools=", ".join(get_approval_required_tools()),
-            goal=state.goal,
+        recent_reasoning = "\n".join(state.reasoning_trace.recent_lines)
+        
+        # Stable across iterations: tools prefix, then goal and email
+        if state.prompt_head is None:
+            head = render_react_goal(goal=state.goal)
+            if state.email:
+                head += "\n" + render_initial_analysis(
+                    from_email=state.email.get("from_email", "Unknown"),
+                    subject=state.email.get("subject", "No subject"),
+                    received=state.email.get("received_utc", "Unknown"),
+                    body=(state.email.get("body_text") or "")[:INITIAL_BODY_CHARS]
+                )
+            state.prompt_head = head
+        
+        # Volatile tail, always last
+        prompt = react_system_prefix() + state.prompt_head + render_react_state(
             iteration=state.iteration,
             max_iterations=state.max_iterations,
-            actions_taken=", ".join(state.actions_taken) if state.actions_taken else "None",
+            actions_taken=state.actions_joined() or "None",
             context_summary=context_summary
         )
         
-        if state.email and state.iteration == 1:
-            prompt += "\n\n" + INITIAL_ANALYSIS_PROMPT.format(
-                from_email=state.email.get("from_email", "Unknown"),
-                subject=state.email.get("subject", "No subject"),
-                received=state.email.get("received_utc", "Unknown"),
-                body=state.email.get("body_text", "")[:2000]
-            )
+        if state.iteration == 1:
+            prompt += "\nStart by deciding your first action.\n"
         elif recent_reasoning:
             prompt += f"\n\n## Recent Steps:\n{recent_reasoning}"
         
@@ -412,39 +1247,35 @@ class ReActAgent:
     
     def _parse_llm_response(self, response: str) -> Dict[str, Any]:
         """Parse LLM response into action decision"""
-        import re
         try:
             # Try to extract JSON from response
             response_text = response.strip()
             
             # Handle markdown code blocks
-            if "```json" in response_text:
-                start = response_text.find("```json") + 7
-                end = response_text.find("```", start)
-                response_text = response_text[start:end].strip()
-            elif "```" in response_text:
-                start = response_text.find("```") + 3
-                end = response_text.find("```", start)
-                response_text = response_text[start:end].strip()
+            if "```" in response_text:
+                fence = _FENCE_RE.search(response_text)
+                response_text = fence.group(1).strip()
             
             # Remove JavaScript-style comments (// ...)
-            response_text = re.sub(r'//.*?(?=\n|$)', '', response_text)
+            if "//" in response_text:
+                response_text = _LINE_COMMENT_RE.sub('', response_text)
             # Remove trailing commas before } or ]
-            response_text = re.sub(r',(\s*[}\]])', r'\1', response_text)
+            response_text = _TRAILING_COMMA_RE.sub(r'\1', response_text)
             
-            return json.loads(response_text)
-        except json.JSONDecodeError:
+            return _loads(response_text)
+        except ValueError:
+            # Both json and orjson decode errors are ValueErrors
             # Fallback: try to extract action and thought from text
             thought = response[:500]
             
             # Try to find action from common patterns
-            action_match = re.search(r'"action"\s*:\s*"([^"]+)"', response)
+            action_match = _ACTION_RE.search(response)
             action = action_match.group(1) if action_match else "think"
             
             # Try to extract action_input
             action_input = {}
             if "search" in action.lower():
-                query_match = re.search(r'"query"\s*:\s*"([^"]+)"', response)
+                query_match = _QUERY_RE.search(response)
                 if query_match:
                     action_input = {"query": query_match.group(1)}
             
@@ -462,7 +1293,7 @@ class ReActAgent:
         
         email = state.email or {}
         iteration = state.iteration
-        actions_taken = set(state.actions_taken)
+        actions_taken = state.actions_taken_set
         
         # Decision tree based on iteration and state
         
@@ -481,10 +1312,8 @@ class ReActAgent:
             body = email.get("body_text", "")
             
             # Simple keyword extraction
-            keywords = []
-            for word in ["acme", "techvision", "globaltech", "api", "migration", "deadline", "urgent"]:
-                if word.lower() in subject.lower() or word.lower() in body.lower():
-                    keywords.append(word)
+            pre = self._preclassified.get(email.get("email_id"))
+            keywords = pre["topics"] if pre else _topic_keywords(f"{subject}\n{body}".lower())
             
             topic = keywords[0] if keywords else subject.split()[0] if subject else "project"
             
@@ -506,11 +1335,12 @@ class ReActAgent:
         # Iteration 4: Determine actionability and create task if needed
         if iteration == 4 and "create_task" not in actions_taken:
             actionability = email.get("actionability_gt", "informational")
+            subject_urgent = "urgent" in (email.get("subject") or "").lower()
             
-            if actionability == "actionable" or "urgent" in email.get("subject", "").lower():
+            if actionability == "actionable" or subject_urgent:
                 # Determine priority
                 priority = "P1"  # Default high for actionable
-                if "urgent" in email.get("subject", "").lower() or "asap" in email.get("body_text", "").lower():
+                if subject_urgent or "asap" in (email.get("body_text") or "").lower():
                     priority = "P0"
                 
                 return {
@@ -581,10 +1411,13 @@ class ReActAgent:
         actionability = email.get("actionability_gt", "unknown")
         
         # Simple analysis
-        is_urgent = any(w in subject.lower() or w in body.lower() 
-                       for w in ["urgent", "asap", "immediately", "critical", "blocker"])
-        has_deadline = any(w in body.lower() 
-                         for w in ["by eod", "by end of", "deadline", "due date", "by tomorrow"])
+        pre = self._preclassified.get(email.get("email_id"))
+        if pre:
+            is_urgent, has_deadline = pre["urgent"], pre["deadline"]
+        else:
+            body_lc = body.lower()
+            is_urgent = _URGENCY_RE.search(subject.lower()) is not None or _URGENCY_RE.search(body_lc) is not None
+            has_deadline = _DEADLINE_RE.search(body_lc) is not None
         is_external = not from_email.endswith("@contoso.com")
         
         analysis = f"""
@@ -613,47 +1446,18 @@ Starting autonomous processing...
     
     def _format_observation(self, tool_name: str, result: Dict[str, Any]) -> str:
         """Format observation from tool result"""
-        
-        if tool_name == "search_emails":
-            count = result.get("result", {}).get("count", 0)
-            return f"Found {count} related emails"
-        
-        elif tool_name == "search_tasks":
-            count = result.get("result", {}).get("count", 0)
-            return f"Found {count} related tasks"
-        
-        elif tool_name == "search_meetings":
-            count = result.get("result", {}).get("count", 0)
-            return f"Found {count} related meetings"
-        
-        elif tool_name == "find_related_context":
-            related = result.get("result", {}).get("related", {})
-            summary = ", ".join([f"{k}: {len(v)}" for k, v in related.items()])
-            return f"Context found: {summary}"
-        
-        elif tool_name == "get_meeting_transcript":
-            has_transcript = result.get("result", {}).get("has_transcript", False)
-            return f"Transcript {'retrieved' if has_transcript else 'not available'}"
-        
-        elif tool_name == "get_meeting_mom":
-            found = result.get("result", {}).get("found", False)
-            return f"Meeting minutes {'found' if found else 'not found'}"
-        
-        elif tool_name == "create_task":
-            task = result.get("result", {}).get("task", {})
-            return f"Task created: {task.get('title', 'Unknown')[:50]} ({task.get('priority', '?')})"
-        
-        elif tool_name == "draft_email_reply":
-            return "Email reply drafted (pending approval)"
-        
-        elif tool_name == "think":
-            return "Thought recorded"
-        
-        else:
+        formatter = _OBSERVATION_FORMATTERS.get(tool_name)
+        if formatter is None:
             return f"Tool {tool_name} executed successfully"
+        return formatter(result)
     
-    def _fallback_decision(self, state: AgentState, error: str) -> Dict[str, Any]:
+    def _fallback_decision(self, state: AgentState, error: BaseException) -> Dict[str, Any]:
         """Fallback decision when LLM fails"""
+        # Provider errors can carry whole response bodies; keep the type and a bounded message
+        message = str(error)
+        if len(message) > ERROR_TEXT_CHARS:
+            message = message[:ERROR_TEXT_CHARS] + "..."
+        error = f"{type(error).__name__}: {message}" if message else type(error).__name__
         return {
             "thought": f"LLM error: {error}. Using fallback logic.",
             "action": "finish",
@@ -680,10 +1484,25 @@ def create_agent(repo, gateway=None, user_email: str = "kowshik.naidu@contoso.co
     )
 
 
+def _advance(gen: Generator[ReasoningStep, None, AgentState]) -> tuple:
+    """(next step, None) from a process_email generator, or (None, final state) once it is done"""
+    try:
+        return next(gen), None
+    except StopIteration as stop:
+        return None, stop.value
+
+
+async def aprocess_email_sync(agent: ReActAgent, email: Dict[str, Any]) -> AgentState:
+    """Await the final state of one email without blocking the event loop"""
+    return await asyncio.to_thread(process_email_sync, agent, email)
+
+
 def process_email_sync(agent: ReActAgent, email: Dict[str, Any]) -> AgentState:
     """Process an email synchronously (collects all steps)"""
-    state = None
-    for step in agent.process_email(email):
-        pass  # Consume all steps
-    # The generator returns the final state
-    return state
+    gen = agent.process_email(email, announce=False)
+    try:
+        while True:
+            next(gen)  # Consume all steps
+    except StopIteration as stop:
+        # The generator returns the final state
+        return stop.value
@@ -1,32 +1,84 @@
 from __future__ import annotations
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from functools import cache
+import io
+import json
 from agents.schemas import Narrative
-from agents import prompts
 from repos.data_repo import DataRepo
-from governance.gateway import PolicyGateway
 from governance.audit import write_audit
 
+try:
+    import orjson
+    _orjson_available = True
+except ImportError:
+    _orjson_available = False
+
+def _compact_json(obj: Any) -> str:
+    if _orjson_available:
+        return orjson.dumps(obj, default=str).decode("utf-8")
+    return json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":"))
+
+_PRIORITY_EMOJI = {"P0": "🔴", "P1": "🟠", "P2": "🟡", "P3": "🟢"}
+_DEFAULT_EMOJI = "⚪"
+_DONE_STATUSES = frozenset(("done", "completed"))
+_STATUS_EMOJI = {"done": "✅", "completed": "✅", "in_progress": "🔄"}
+_DEFAULT_STATUS_EMOJI = "⏳"
+# Bound once so the per-task lookups skip the attribute fetch
+_priority_emoji = _PRIORITY_EMOJI.get
+_status_emoji = _STATUS_EMOJI.get
+
+@cache
+def _template(name: str) -> Callable[..., str]:
+    """
+    Report layout from agents/templates/, compiled on first use. Their loops
+    need jinja2, so importing this module doesn't.
+    """
+    from agents import prompts
+    return prompts.load_template(name)
+
+
 class ReportingAgent:
     def __init__(self, repo: DataRepo):
         self.repo = repo
-        self.gw = PolicyGateway("reporting_agent")
+        # Built on first LLM call; reports with ground-truth narratives never import the gateway
+        self._gw = None
+        # id -> record snapshots, set only for the duration of a report run
+        self._task_idx: Optional[Dict[str, Dict[str, Any]]] = None
+        self._email_idx: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @property
+    def gw(self):
+        if self._gw is None:
+            from governance.gateway import PolicyGateway
+            self._gw = PolicyGateway("reporting_agent")
+        return self._gw
+
+    @contextmanager
+    def _build_indices(self):
+        """Fetch the repo's id indexes once for a whole report run instead of per lookup"""
+        self._task_idx = self.repo.task_index()
+        self._email_idx = self.repo.email_index()
+        try:
+            yield
+        finally:
+            self._task_idx = self._email_idx = None
+
+    def _task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        idx = self._task_idx
+        return idx.get(task_id) if idx is not None else self.repo.task_by_id(task_id)
 
     def _get_task_details(self, task_id: str) -> Dict[str, Any]:
         """Get full task details by ID"""
-        tasks = self.repo.tasks()
-        for t in tasks:
-            if t.get("task_id") == task_id:
-                return t
-        return {"task_id": task_id, "title": task_id, "priority": "P3"}
+        return self._task(task_id) or {"task_id": task_id, "title": task_id, "priority": "P3"}
 
     def _get_email_details(self, email_id: str) -> Dict[str, Any]:
         """Get email details by ID"""
-        emails = self.repo.inbox()
-        for e in emails:
-            if e.get("email_id") == email_id:
-                return e
-        return {"email_id": email_id, "subject": email_id}
+        idx = self._email_idx
+        email = idx.get(email_id) if idx is not None else self.repo.email_by_id(email_id)
+        return email or {"email_id": email_id, "subject": email_id}
 
     def _calculate_productivity_score(self, e: dict) -> int:
         """Calculate productivity score based on task completion"""
@@ -52,9 +104,15 @@ class ReportingAgent:
 
     def _get_priority_breakdown(self, task_ids: List[str]) -> Dict[str, int]:
         """Get count of tasks by priority"""
+        tasks = self.repo.tasks_by_ids(task_ids)
+        # Unknown ids count as P3, like _get_task_details' placeholder
+        return self._count_priorities(tasks.get(tid) or {"priority": "P3"} for tid in task_ids)
+
+    @staticmethod
+    def _count_priorities(tasks) -> Dict[str, int]:
+        """Count of already-resolved tasks by priority"""
         breakdown = {"P0": 0, "P1": 0, "P2": 0, "P3": 0}
-        for tid in task_ids:
-            task = self._get_task_details(tid)
+        for task in tasks:
             priority = task.get("priority", "P3")
             if priority in breakdown:
                 breakdown[priority] += 1
@@ -62,325 +120,192 @@ class ReportingAgent:
 
     def format_eod_pretty(self, e: dict, narrative: str) -> str:
         """Build a comprehensive, detailed EOD report"""
-        lines = []
-        
-        # Header with date and productivity score
         prod_score = self._calculate_productivity_score(e)
         score_emoji = "🟢" if prod_score >= 70 else "🟡" if prod_score >= 50 else "🔴"
-        
-        lines.append("# 📊 End of Day Report")
-        lines.append("")
-        lines.append(f"**📅 Date:** {e.get('date', datetime.now().strftime('%Y-%m-%d'))}")
-        lines.append(f"**👤 User:** {e.get('user_id', 'Unknown')}")
-        lines.append(f"**{score_emoji} Productivity Score:** {prod_score}/100")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-
-        # Executive Summary
-        lines.append("## 📝 Executive Summary")
-        lines.append("")
-        lines.append(narrative.strip() or "No summary available.")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-
-        # Task Statistics
+
         completed = e.get("tasks_completed", [])
         inprog = e.get("tasks_in_progress", [])
         pending = e.get("tasks_pending", [])
-        total_tasks = len(completed) + len(inprog) + len(pending)
-        
-        lines.append("## 📈 Daily Statistics")
-        lines.append("")
-        lines.append(f"| Metric | Count | Percentage |")
-        lines.append(f"|--------|-------|------------|")
-        lines.append(f"| ✅ Completed | {len(completed)} | {int(len(completed)/total_tasks*100) if total_tasks else 0}% |")
-        lines.append(f"| 🔄 In Progress | {len(inprog)} | {int(len(inprog)/total_tasks*100) if total_tasks else 0}% |")
-        lines.append(f"| ⏳ Pending | {len(pending)} | {int(len(pending)/total_tasks*100) if total_tasks else 0}% |")
-        lines.append(f"| **Total** | **{total_tasks}** | **100%** |")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-
-        # Completed Tasks with Details
-        lines.append("## ✅ Completed Tasks")
-        lines.append("")
-        if completed:
-            for tid in completed:
-                task = self._get_task_details(tid)
-                title = task.get("title", tid)
-                priority = task.get("priority", "P3")
-                tags = task.get("tags", [])
-                priority_emoji = {"P0": "🔴", "P1": "🟠", "P2": "🟡", "P3": "🟢"}.get(priority, "⚪")
-                
-                lines.append(f"### {priority_emoji} [{priority}] {title}")
-                if task.get("description"):
-                    lines.append(f"> {task.get('description', '')[:150]}...")
-                if tags:
-                    lines.append(f"**Tags:** {', '.join(tags)}")
-                lines.append("")
-        else:
-            lines.append("*No tasks completed today.*")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-
-        # In Progress with Details
-        lines.append("## 🔄 In Progress")
-        lines.append("")
-        if inprog:
-            priority_breakdown = self._get_priority_breakdown(inprog)
-            lines.append(f"**Priority Breakdown:** 🔴 P0: {priority_breakdown['P0']} | 🟠 P1: {priority_breakdown['P1']} | 🟡 P2: {priority_breakdown['P2']} | 🟢 P3: {priority_breakdown['P3']}")
-            lines.append("")
-            
-            for tid in inprog:
-                task = self._get_task_details(tid)
-                title = task.get("title", tid)
-                priority = task.get("priority", "P3")
-                due = task.get("due_date_utc", "No due date")[:10] if task.get("due_date_utc") else "No due date"
-                priority_emoji = {"P0": "🔴", "P1": "🟠", "P2": "🟡", "P3": "🟢"}.get(priority, "⚪")
-                
-                lines.append(f"- {priority_emoji} **[{priority}]** {title} *(Due: {due})*")
-        else:
-            lines.append("*No tasks in progress.*")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-
-        # Pending Tasks
-        lines.append("## ⏳ Pending Tasks")
-        lines.append("")
-        if pending:
-            priority_breakdown = self._get_priority_breakdown(pending)
-            lines.append(f"**Priority Breakdown:** 🔴 P0: {priority_breakdown['P0']} | 🟠 P1: {priority_breakdown['P1']} | 🟡 P2: {priority_breakdown['P2']} | 🟢 P3: {priority_breakdown['P3']}")
-            lines.append("")
-            
-            for tid in pending:
-                task = self._get_task_details(tid)
-                title = task.get("title", tid)
+        # Resolved once; the sections, breakdowns and focus list below all reuse these
+        inprog_tasks = [self._get_task_details(tid) for tid in inprog]
+        pending_tasks = [self._get_task_details(tid) for tid in pending]
+        counts = {"completed": len(completed), "inprog": len(inprog), "pending": len(pending)}
+        total_tasks = sum(counts.values())
+
+        # Base rows are shared by every mention of a task id in this report; sections
+        # that print more fields extend a copy, so the shared row is never mutated
+        rows: Dict[str, Dict[str, Any]] = {}
+
+        def row(tid, task):
+            base = rows.get(tid)
+            if base is None:
                 priority = task.get("priority", "P3")
-                priority_emoji = {"P0": "🔴", "P1": "🟠", "P2": "🟡", "P3": "🟢"}.get(priority, "⚪")
-                
-                lines.append(f"- {priority_emoji} **[{priority}]** {title}")
-        else:
-            lines.append("*No pending tasks.*")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-
-        # Follow-ups
-        fus = e.get("followups_triggered", [])
-        lines.append("## 🔔 Follow-ups & Reminders")
-        lines.append("")
-        if fus:
-            for f in fus:
-                lines.append(f"- ⏰ {f}")
-        else:
-            lines.append("*No follow-ups triggered today.*")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-
-        # Risks
-        risks = e.get("risks_flagged", [])
-        lines.append("## ⚠️ Risks & Blockers")
-        lines.append("")
-        if risks:
-            lines.append(f"**{len(risks)} risk(s) identified:**")
-            lines.append("")
-            for r in risks:
-                task = self._get_task_details(r)
-                title = task.get("title", r)
-                lines.append(f"- 🚨 **{title}**")
-                if task.get("description"):
-                    lines.append(f"  - Impact: {task.get('description', '')[:100]}...")
-        else:
-            lines.append("✅ *No risks flagged today.*")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-
-        # Tomorrow's Focus
-        lines.append("## 🎯 Tomorrow's Focus")
-        lines.append("")
-        # Get P0 and P1 tasks from pending and in_progress
-        high_priority = []
-        for tid in inprog + pending:
+                base = rows[tid] = {"title": task.get("title", tid), "priority": priority,
+                                    "emoji": _priority_emoji(priority, _DEFAULT_EMOJI)}
+            return base
+
+        completed_rows = []
+        for tid in completed:
             task = self._get_task_details(tid)
-            if task.get("priority") in ["P0", "P1"]:
-                high_priority.append(task)
-        
-        if high_priority:
-            lines.append("**High Priority Items to Address:**")
-            for task in high_priority[:5]:
-                lines.append(f"1. {task.get('title', 'Unknown task')}")
-        else:
-            lines.append("*No critical items pending. Good job!*")
-        lines.append("")
+            desc = task.get("description")
+            completed_rows.append({**row(tid, task), "description": desc[:150] if desc else "",
+                                   "tags": task.get("tags", [])})
+
+        inprog_rows = []
+        for tid, task in zip(inprog, inprog_tasks):
+            due = task.get("due_date_utc")
+            inprog_rows.append({**row(tid, task), "due": due[:10] if due else "No due date"})
+
+        risks = []
+        for r in e.get("risks_flagged", []):
+            task = self._get_task_details(r)
+            desc = task.get("description")
+            risks.append({"title": task.get("title", r), "impact": desc[:100] if desc else ""})
+
+        # Get P0 and P1 tasks from pending and in_progress
+        high_priority = [task.get("title", "Unknown task") for task in inprog_tasks + pending_tasks
+                         if task.get("priority") in ("P0", "P1")]
+
+        return _template("eod.md.j2")(
+            # Only read the clock when the entry has no date of its own
+            date=e["date"] if "date" in e else datetime.now().strftime("%Y-%m-%d"),
+            user_id=e.get("user_id", "Unknown"),
+            score_emoji=score_emoji,
+            prod_score=prod_score,
+            narrative=narrative.strip() or "No summary available.",
+            counts=counts,
+            pct={k: int(n / total_tasks * 100) if total_tasks else 0 for k, n in counts.items()},
+            total_tasks=total_tasks,
+            completed=completed_rows,
+            inprog=inprog_rows,
+            inprog_breakdown=self._count_priorities(inprog_tasks),
+            pending=[row(tid, task) for tid, task in zip(pending, pending_tasks)],
+            pending_breakdown=self._count_priorities(pending_tasks),
+            followups=e.get("followups_triggered", []),
+            risks=risks,
+            focus=high_priority[:5],
+        )
+
+    def _slim_tasks(self, task_ids: List[Any]) -> List[Dict[str, Any]]:
+        """Project tasks to the few fields the EOD prompt needs: title, priority, due day"""
+        slim = []
+        for ref in task_ids:
+            task = ref if isinstance(ref, dict) else (self._task(ref) or {"title": ref})
+            due = task.get("due_date_utc")
+            slim.append({"t": task.get("title", ""), "p": task.get("priority"), "d": due[:10] if due else None})
+        return slim
 
-        return "\n".join(lines)
+    def _eod_prompt(self, e: dict) -> str:
+        from agents import prompts
+        return prompts.render_eod(
+            completed=_compact_json(self._slim_tasks(e.get("tasks_completed", []))),
+            in_progress=_compact_json(self._slim_tasks(e.get("tasks_in_progress", []))),
+            pending=_compact_json(self._slim_tasks(e.get("tasks_pending", []))),
+            followups=_compact_json(e.get("followups_triggered", [])),
+        )
+
+    def _render_one_eod(self, e: dict, narrative: str) -> Narrative:
+        pretty = self.format_eod_pretty(e, narrative)
+        # Fields are built here from repo data, so skip pydantic's validation pass
+        return Narrative.model_construct(kind="eod", narrative=pretty, correlation_ids=e.get("correlation_ids", []))
 
     def eod(self) -> List[Narrative]:
-        out = []
-        for e in self.repo.eod():
-            # If ground truth exists, use it; else generate
-            nar = e.get("narrative_gt")
-            if not nar:
-                nar = self.gw.call_llm(
-                    prompts.EOD_PROMPT.format(
-                        completed=e.get("tasks_completed", []),
-                        in_progress=e.get("tasks_in_progress", []),
-                        pending=e.get("tasks_pending", []),
-                        followups=e.get("followups_triggered", []),
-                    )
-                )
-
-            pretty = self.format_eod_pretty(e, nar)
-            out.append(Narrative(kind="eod", narrative=pretty, correlation_ids=e.get("correlation_ids", [])))
+        entries = self.repo.eod()
+        out: List[Any] = [None] * len(entries)
+        with self._build_indices(), ThreadPoolExecutor(max_workers=1) as pool:
+            # If ground truth exists, use it; else generate. Missing narratives go out as one batch
+            missing = [i for i, e in enumerate(entries) if not e.get("narrative_gt")]
+            pending = None
+            if missing:
+                pending = pool.submit(self.gw.batch_call_llm, [self._eod_prompt(entries[i]) for i in missing])
+
+            # Ground-truth entries render while the LLM batch is in flight
+            skip = set(missing)
+            for i, e in enumerate(entries):
+                if i not in skip:
+                    out[i] = self._render_one_eod(e, e.get("narrative_gt"))
+
+            if pending is not None:
+                for i, nar in zip(missing, pending.result()):
+                    if isinstance(nar, Exception):
+                        raise nar
+                    out[i] = self._render_one_eod(entries[i], nar)
 
         write_audit("system", "reporting_agent", "generate_eod", [], [], "success")
         return out
 
     def format_weekly_pretty(self, w: dict, narrative: str) -> str:
         """Build a comprehensive weekly summary report"""
-        lines = []
-        
-        # Header
-        lines.append("# 📊 Weekly Summary Report")
-        lines.append("")
-        lines.append(f"**📅 Week:** {w.get('week_id', 'Unknown')}")
-        lines.append(f"**👥 Team:** {w.get('team_id', 'Unknown')}")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-
-        # Executive Summary
-        lines.append("## 📝 Executive Summary")
-        lines.append("")
         exec_summary = w.get("exec_summary_gt", narrative)
-        lines.append(exec_summary.strip() if exec_summary else "No summary available.")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
 
-        # Velocity Metrics
         metrics = w.get("velocity_metrics", {})
-        # Initialize carryover outside the if block so it's always defined
         carryover = metrics.get("carryover", 0) if metrics else 0
-        
-        if metrics:
-            lines.append("## 📈 Velocity Metrics")
-            lines.append("")
-            
-            story_points = metrics.get("story_points_completed", 0)
-            defects = metrics.get("defects", 0)
-            
-            # Calculate velocity health
-            if carryover == 0:
-                health = "🟢 Excellent"
-            elif carryover <= story_points * 0.2:
-                health = "🟡 Good"
-            else:
-                health = "🔴 Needs Attention"
-            
-            lines.append(f"| Metric | Value | Status |")
-            lines.append(f"|--------|-------|--------|")
-            lines.append(f"| Story Points Completed | {story_points} | ✅ |")
-            lines.append(f"| Carryover | {carryover} | {'⚠️' if carryover > 0 else '✅'} |")
-            lines.append(f"| Defects | {defects} | {'⚠️' if defects > 2 else '✅'} |")
-            lines.append(f"| **Sprint Health** | - | **{health}** |")
-            lines.append("")
-            
-            # Completion rate
-            total_planned = story_points + carryover
-            completion_rate = int((story_points / total_planned) * 100) if total_planned > 0 else 100
-            lines.append(f"**Completion Rate:** {completion_rate}%")
-            lines.append("")
-            lines.append("---")
-            lines.append("")
-
-        # Milestones
-        milestones = w.get("milestones_achieved", [])
-        lines.append("## 🏆 Milestones Achieved")
-        lines.append("")
-        if milestones:
-            for m in milestones:
-                lines.append(f"- ✅ **{m}**")
-        else:
-            lines.append("*No milestones achieved this week.*")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-
-        # Risks
-        risks = w.get("top_risks", [])
-        lines.append("## ⚠️ Top Risks")
-        lines.append("")
-        if risks:
-            lines.append(f"**{len(risks)} risk(s) being tracked:**")
-            lines.append("")
-            for i, risk in enumerate(risks, 1):
-                risk_text = risk.get("risk", risk) if isinstance(risk, dict) else risk
-                owner = risk.get("owner_email", "Unassigned") if isinstance(risk, dict) else "Unassigned"
-                mitigation = risk.get("mitigation", "No mitigation plan") if isinstance(risk, dict) else "No mitigation plan"
-                
-                lines.append(f"### Risk #{i}: {risk_text}")
-                lines.append(f"- **Owner:** {owner}")
-                lines.append(f"- **Mitigation:** {mitigation}")
-                lines.append("")
+        story_points = metrics.get("story_points_completed", 0) if metrics else 0
+
+        # Calculate velocity health
+        if carryover == 0:
+            health = "🟢 Excellent"
+        elif carryover <= story_points * 0.2:
+            health = "🟡 Good"
         else:
-            lines.append("✅ *No significant risks this week.*")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-
-        # Weekly highlights from emails and tasks
-        lines.append("## 📬 Activity Summary")
-        lines.append("")
-        
+            health = "🔴 Needs Attention"
+        total_planned = story_points + carryover
+
+        risks = []
+        for risk in w.get("top_risks", []):
+            if isinstance(risk, dict):
+                risks.append({
+                    "text": risk.get("risk", risk),
+                    "owner": risk.get("owner_email", "Unassigned"),
+                    "mitigation": risk.get("mitigation", "No mitigation plan"),
+                })
+            else:
+                risks.append({"text": risk, "owner": "Unassigned", "mitigation": "No mitigation plan"})
+
         # Get email count for the week
-        emails = self.repo.inbox()
-        processed = len([e for e in emails if e.get("processed", False)])
-        actionable = len([e for e in emails if e.get("actionability_gt") == "actionable"])
-        
-        lines.append(f"| Activity | Count |")
-        lines.append(f"|----------|-------|")
-        lines.append(f"| Emails Processed | {processed} |")
-        lines.append(f"| Actionable Items | {actionable} |")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-
-        # Next Week Focus
-        lines.append("## 🎯 Next Week Focus")
-        lines.append("")
-        if risks:
-            lines.append("**Priority Items:**")
-            for risk in risks[:3]:
-                risk_text = risk.get("risk", risk) if isinstance(risk, dict) else risk
-                lines.append(f"1. Address: {risk_text}")
-        
-        if carryover > 0:
-            lines.append(f"2. Complete {carryover} carryover items")
-        
-        lines.append("")
+        processed = actionable = 0
+        for e in self.repo.inbox():
+            if e.get("processed", False):
+                processed += 1
+            if e.get("actionability_gt") == "actionable":
+                actionable += 1
 
-        return "\n".join(lines)
+        return _template("weekly.md.j2")(
+            week_id=w.get("week_id", "Unknown"),
+            team_id=w.get("team_id", "Unknown"),
+            exec_summary=exec_summary.strip() if exec_summary else "No summary available.",
+            metrics=metrics,
+            story_points=story_points,
+            carryover=carryover,
+            defects=metrics.get("defects", 0) if metrics else 0,
+            health=health,
+            completion_rate=int((story_points / total_planned) * 100) if total_planned > 0 else 100,
+            milestones=w.get("milestones_achieved", []),
+            risks=risks,
+            processed=processed,
+            actionable=actionable,
+        )
 
     def weekly(self) -> List[Narrative]:
         outs = []
+        fallback = None  # the fallback prompt is the same for every week, so it is asked once
         for w in self.repo.weekly():
-            nar = w.get("narrative_gt") or w.get("exec_summary_gt") or self.gw.call_llm("Give weekly summary in 3-5 bullets.")
+            nar = w.get("narrative_gt") or w.get("exec_summary_gt")
+            if not nar:
+                if fallback is None:
+                    fallback = self.gw.call_llm("Give weekly summary in 3-5 bullets.")
+                nar = fallback
             pretty = self.format_weekly_pretty(w, nar)
-            outs.append(Narrative(kind="weekly", narrative=pretty, correlation_ids=w.get("correlation_ids", [])))
+            outs.append(Narrative.model_construct(kind="weekly", narrative=pretty,
+                                                  correlation_ids=w.get("correlation_ids", [])))
 
         write_audit("system", "reporting_agent", "generate_weekly", [], [], "success")
         return outs
     
     def generate_comprehensive_eod(self, user_email: str = None) -> str:
         """Generate a comprehensive EOD report with real-time data"""
-        lines = []
+        buf = io.StringIO()
+        w = buf.write
         
         # Get current data
         tasks = self.repo.tasks()
@@ -395,67 +320,93 @@ class ReportingAgent:
             user_id = None
         
         # Calculate stats
-        today = datetime.now().strftime("%Y-%m-%d")
+        now = datetime.now()
+        today = now.strftime("%Y-%m-%d")
         
-        completed = [t for t in tasks if t.get("status") in ["done", "completed"]]
-        in_progress = [t for t in tasks if t.get("status") == "in_progress"]
-        pending = [t for t in tasks if t.get("status") == "todo"]
-        
-        p0_tasks = [t for t in tasks if t.get("priority") == "P0"]
-        overdue = [t for t in tasks if t.get("due_date_utc") and t.get("due_date_utc")[:10] < today and t.get("status") not in ["done", "completed"]]
+        # One pass over tasks fills every bucket
+        completed, in_progress, pending, p0_tasks, overdue = [], [], [], [], []
+        for t in tasks:
+            status = t.get("status")
+            done = status in _DONE_STATUSES
+            if done:
+                completed.append(t)
+            elif status == "in_progress":
+                in_progress.append(t)
+            elif status == "todo":
+                pending.append(t)
+            if t.get("priority") == "P0":
+                p0_tasks.append(t)
+            due = t.get("due_date_utc")
+            # today is a 10-char date, so comparing whole ISO strings matches comparing due[:10]
+            if due and not done and due < today:
+                overdue.append(t)
         
-        processed_emails = [e for e in emails if e.get("processed", False)]
-        actionable_emails = [e for e in emails if e.get("actionability_gt") == "actionable"]
+        processed_count = actionable_count = pending_action = 0
+        for e in emails:
+            processed = e.get("processed", False)
+            if processed:
+                processed_count += 1
+            if e.get("actionability_gt") == "actionable":
+                actionable_count += 1
+                if not processed:
+                    pending_action += 1
         
         # Build report
-        lines.append("# 📊 Comprehensive End of Day Report")
-        lines.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
+        w("# 📊 Comprehensive End of Day Report\n")
+        w(f"**Generated:** {now.strftime('%Y-%m-%d %H:%M')}\n")
+        w("\n")
+        w("---\n")
+        w("\n")
         
         # Task Overview
-        lines.append("## 📋 Task Overview")
-        lines.append("")
-        lines.append(f"| Status | Count |")
-        lines.append(f"|--------|-------|")
-        lines.append(f"| ✅ Completed | {len(completed)} |")
-        lines.append(f"| 🔄 In Progress | {len(in_progress)} |")
-        lines.append(f"| ⏳ Pending | {len(pending)} |")
-        lines.append(f"| 🔴 Critical (P0) | {len(p0_tasks)} |")
-        lines.append(f"| ⚠️ Overdue | {len(overdue)} |")
-        lines.append("")
+        w("## 📋 Task Overview\n")
+        w("\n")
+        w(
+            "| Status | Count |\n"
+            "|--------|-------|\n"
+            f"| ✅ Completed | {len(completed)} |\n"
+            f"| 🔄 In Progress | {len(in_progress)} |\n"
+            f"| ⏳ Pending | {len(pending)} |\n"
+            f"| 🔴 Critical (P0) | {len(p0_tasks)} |\n"
+            f"| ⚠️ Overdue | {len(overdue)} |\n"
+        )
+        w("\n")
         
         # Critical items
         if p0_tasks:
-            lines.append("### 🚨 Critical Tasks (P0)")
+            w("### 🚨 Critical Tasks (P0)\n")
             for t in p0_tasks:
-                status_emoji = "✅" if t.get("status") in ["done", "completed"] else "🔄" if t.get("status") == "in_progress" else "⏳"
-                lines.append(f"- {status_emoji} {t.get('title', 'Unknown')}")
-            lines.append("")
+                status_emoji = _status_emoji(t.get("status"), _DEFAULT_STATUS_EMOJI)
+                w(f"- {status_emoji} {t.get('title', 'Unknown')}\n")
+            w("\n")
         
         # Overdue items
         if overdue:
-            lines.append("### ⚠️ Overdue Tasks")
+            w("### ⚠️ Overdue Tasks\n")
             for t in overdue:
-                lines.append(f"- 🔴 {t.get('title', 'Unknown')} (Due: {t.get('due_date_utc', '')[:10]})")
-            lines.append("")
+                w(f"- 🔴 {t.get('title', 'Unknown')} (Due: {t.get('due_date_utc', '')[:10]})\n")
+            w("\n")
         
         # Email summary
-        lines.append("## 📧 Email Summary")
-        lines.append("")
-        lines.append(f"- **Total Processed:** {len(processed_emails)}")
-        lines.append(f"- **Actionable:** {len(actionable_emails)}")
-        lines.append(f"- **Pending Action:** {len([e for e in actionable_emails if not e.get('processed')])}")
-        lines.append("")
+        w("## 📧 Email Summary\n")
+        w("\n")
+        w(f"- **Total Processed:** {processed_count}\n")
+        w(f"- **Actionable:** {actionable_count}\n")
+        w(f"- **Pending Action:** {pending_action}\n")
+        w("\n")
         
         # Meeting summary
-        lines.append("## 📅 Meetings")
-        lines.append("")
-        today_meetings = [m for m in meetings if m.get("start_utc", "")[:10] == today]
-        lines.append(f"**Today's Meetings:** {len(today_meetings)}")
-        for m in today_meetings[:5]:
-            lines.append(f"- {m.get('title', 'Unknown meeting')}")
-        lines.append("")
+        w("## 📅 Meetings\n")
+        w("\n")
+        # Count today's meetings while keeping only the first five titles
+        today_count, today_titles = 0, []
+        for m in meetings:
+            if m.get("start_utc", "")[:10] == today:
+                today_count += 1
+                if today_count <= 5:
+                    today_titles.append(m.get("title", "Unknown meeting"))
+        w(f"**Today's Meetings:** {today_count}\n")
+        for title in today_titles:
+            w(f"- {title}\n")
         
-        return "\n".join(lines)
\ No newline at end of file
+        return buf.getvalue()
\ No newline at end of file
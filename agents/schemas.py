@@ -2,10 +2,15 @@
 from __future__ import annotations
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
 
+def _utcnow_iso() -> str:
+    """Naive UTC ISO timestamp; one shared default_factory for the models below"""
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
 # ============================================================
 # AGENTIC AI SCHEMAS
 # ============================================================
@@ -38,7 +43,7 @@ class ToolCall(BaseModel):
     result: Optional[Dict[str, Any]] = None
     success: bool = True
     requires_approval: bool = False
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = Field(default_factory=_utcnow_iso)
 
 
 class AgentReasoningStep(BaseModel):
@@ -47,7 +52,7 @@ class AgentReasoningStep(BaseModel):
     content: str
     tool_call: Optional[ToolCall] = None
     iteration: int = 0
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = Field(default_factory=_utcnow_iso)
 
 
 class PendingAction(BaseModel):
@@ -61,7 +66,7 @@ class PendingAction(BaseModel):
     source_meeting_id: Optional[str] = None
     agent_reasoning: str = ""
     status: str = "pending"  # pending, approved, rejected, executed
-    created_utc: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_utc: str = Field(default_factory=_utcnow_iso)
     reviewed_utc: Optional[str] = None
     reviewed_by: Optional[str] = None
 
@@ -78,7 +83,7 @@ class AgentSession(BaseModel):
     pending_approvals: List[PendingAction] = []
     context_gathered: Dict[str, Any] = {}
     final_summary: Optional[str] = None
-    started_utc: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    started_utc: str = Field(default_factory=_utcnow_iso)
     completed_utc: Optional[str] = None
     total_iterations: int = 0
 
@@ -90,7 +95,7 @@ class AgentActivityEvent(BaseModel):
     session_id: str
     content: str
     metadata: Dict[str, Any] = {}
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = Field(default_factory=_utcnow_iso)
 
 
 # ============================================================
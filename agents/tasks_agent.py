@@ -24,8 +24,7 @@ class TasksAgent:
 
     def _user_ids_for_email(self, user_email: str) -> Set[str]:
         # Find all users with this email (usually one)
-        users = [u for u in self.repo.users() if u.get("email") == user_email]
-        return {u["user_id"] for u in users}
+        return set(self.repo.user_ids_by_email(user_email))
 
     def _tasks_for_user(self, user_email: str) -> List[Dict[str, Any]]:
         owner_ids = self._user_ids_for_email(user_email)
@@ -38,10 +37,7 @@ class TasksAgent:
         # If empty, try a permissive fallback: tasks that mention the user's email in description/title (optional)
         if not mine:
             lowered = user_email.lower()
-            mine = [
-                t for t in tasks
-                if lowered in (t.get("description","") + " " + t.get("title","")).lower()
-            ]
+            mine = [t for t, blob in self.repo.task_search_blobs() if lowered in blob]
         return mine
 
     def plan_today(self, user_email: str) -> TodayPlan:
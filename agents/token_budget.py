@@ -0,0 +1,48 @@
+"""
+Token Budget Helpers
+====================
+Token truncation for prompts that must fit a context budget.
+
+Uses tiktoken when installed (see requirements.txt). Without it, or when its
+encoding can't be loaded, falls back to the ~4 chars per token estimate the
+gateway already uses for simulated usage.
+"""
+
+from __future__ import annotations
+
+try:
+    import tiktoken
+    _tiktoken_available = True
+except ImportError:
+    _tiktoken_available = False
+
+CHARS_PER_TOKEN = 4
+
+_ENC = None
+_enc_loaded = False
+
+
+def _encoding():
+    """tiktoken encoding, loaded on first use (it may download the BPE file)"""
+    global _ENC, _enc_loaded
+    if not _enc_loaded:
+        if _tiktoken_available:
+            try:
+                _ENC = tiktoken.encoding_for_model("gpt-4o")
+            except Exception:
+                try:
+                    _ENC = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    # Offline with no cached encoding: use the estimate
+                    _ENC = None
+        _enc_loaded = True
+    return _ENC
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Longest prefix of text within max_tokens"""
+    enc = _encoding()
+    if enc is not None:
+        ids = enc.encode_ordinary(text)
+        return text if len(ids) <= max_tokens else enc.decode(ids[:max_tokens])
+    return text[:max_tokens * CHARS_PER_TOKEN]
@@ -7,10 +7,11 @@ Each tool has: name, description, parameters schema, requires_approval flag, and
 """
 
 from __future__ import annotations
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, FrozenSet, Iterable, List, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, date
 import json
+import sys
 import uuid
 from pydantic import BaseModel, Field
 
@@ -19,55 +20,105 @@ from pydantic import BaseModel, Field
 # TOOL SCHEMA DEFINITIONS
 # ============================================================
 
-@dataclass
+# JSON schema type -> code used by Tool.to_compact_schema
+_TYPE_CODES = {"string": "s", "integer": "i", "boolean": "b", "array": "a", "object": "o"}
+
+# Categories the registered tools use; Tool also accepts its "general" default
+CATEGORIES: FrozenSet[str] = frozenset({"read", "write", "search", "communicate", "analyze", "meta"})
+_ALLOWED_CATEGORIES = CATEGORIES | {"general"}
+
+
+@dataclass(frozen=True, slots=True)
 class ToolParameter:
     """Single parameter definition"""
     name: str
     type: str  # string, integer, boolean, array, object
     description: str
     required: bool = True
-    enum: Optional[List[str]] = None
+    enum: Optional[Tuple[str, ...]] = None
     default: Any = None
+    
+    def __post_init__(self):
+        if self.enum is not None and not isinstance(self.enum, tuple):
+            object.__setattr__(self, "enum", tuple(self.enum))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Tool:
-    """Tool definition with OpenAI-compatible schema"""
+    """Tool definition with OpenAI-compatible schema (immutable and hashable)"""
     name: str
     description: str
-    parameters: List[ToolParameter]
+    parameters: Tuple[ToolParameter, ...]
     requires_approval: bool = False
-    category: str = "general"  # read, write, search, communicate, analyze
+    category: str = "general"  # one of CATEGORIES; checked in __post_init__
+    # Derived from parameters in __post_init__; tools don't change after registration
+    _properties: Dict[str, Dict[str, Any]] = field(init=False, repr=False, compare=False)
+    _required: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    # Built on first to_openai_schema() call from the pieces above
+    _schema: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
-    def to_openai_schema(self) -> Dict[str, Any]:
-        """Convert to OpenAI function calling format"""
+    def __post_init__(self):
+        if self.category not in _ALLOWED_CATEGORIES:
+            raise ValueError(f"Tool {self.name!r}: unknown category {self.category!r}")
+        # Frozen: derived fields go through object.__setattr__
+        # Interned: names parsed from LLM output are interned too, so lookups hit on identity
+        object.__setattr__(self, "name", sys.intern(self.name))
+        # Registrations written with lists still end up immutable
+        if not isinstance(self.parameters, tuple):
+            object.__setattr__(self, "parameters", tuple(self.parameters))
         properties = {}
-        required = []
-        
         for param in self.parameters:
             prop = {
                 "type": param.type,
                 "description": param.description
             }
             if param.enum:
-                prop["enum"] = param.enum
+                prop["enum"] = list(param.enum)
             properties[param.name] = prop
-            
-            if param.required:
-                required.append(param.name)
-        
+        object.__setattr__(self, "_properties", properties)
+        object.__setattr__(self, "_required", tuple(p.name for p in self.parameters if p.required))
+    
+    def to_summary(self) -> Dict[str, str]:
+        """Name plus the description's first sentence; the resident, always-shipped form"""
+        first = self.description.split(". ", 1)[0].rstrip(".")
+        return {"name": self.name, "desc": first[:80]}
+    
+    def to_compact_schema(self) -> Dict[str, Any]:
+        """
+        Token-lean schema: single-letter type codes (see _TYPE_CODES), short keys,
+        no wrapper objects. The ReAct prompt documents the format once.
+        """
+        params = {}
+        for param in self.parameters:
+            spec = {"t": _TYPE_CODES.get(param.type, param.type), "d": param.description}
+            if param.enum:
+                spec["e"] = list(param.enum)
+            params[param.name] = spec
         return {
+            "name": self.name,
+            "desc": self.description,
+            "params": params,
+            "req": list(self._required)
+        }
+    
+    def to_openai_schema(self) -> Dict[str, Any]:
+        """Convert to OpenAI function calling format (cached; treat the result as read-only)"""
+        if self._schema is not None:
+            return self._schema
+        schema = {
             "type": "function",
             "function": {
                 "name": self.name,
                 "description": self.description,
                 "parameters": {
                     "type": "object",
-                    "properties": properties,
-                    "required": required
+                    "properties": self._properties,
+                    "required": list(self._required)
                 }
             }
         }
+        object.__setattr__(self, "_schema", schema)
+        return schema
 
 
 # ============================================================
@@ -75,22 +126,39 @@ class Tool:
 # ============================================================
 
 TOOLS: Dict[str, Tool] = {}
+_tools_version = 0
+# Required parameter names per tool, computed once at registration
+_REQUIRED_PARAMS: Dict[str, FrozenSet[str]] = {}
+# Approval-gated tool names in registration order, maintained by register_tool
+_APPROVAL_TOOLS: List[str] = []
 
 
 def register_tool(tool: Tool) -> Tool:
     """Register a tool in the global registry"""
+    global _tools_version
     TOOLS[tool.name] = tool
+    _REQUIRED_PARAMS[tool.name] = frozenset(tool._required)
+    if tool.name in _APPROVAL_TOOLS:
+        _APPROVAL_TOOLS.remove(tool.name)
+    if tool.requires_approval:
+        _APPROVAL_TOOLS.append(tool.name)
+    _tools_version += 1
     return tool
 
 
+def tools_version() -> int:
+    """Bumped on every registration, so derived prompt text can be cached against it"""
+    return _tools_version
+
+
 # --- READ TOOLS ---
 
 register_tool(Tool(
     name="read_email",
     description="Read the full content of a specific email by ID. Use this to get complete email details including body, sender, subject.",
-    parameters=[
-        ToolParameter("email_id", "string", "The unique email ID (e.g., 'eml_xxx')")
-    ],
+    parameters=(
+        ToolParameter("email_id", "string", "The unique email ID (e.g., 'eml_xxx')"),
+    ),
     requires_approval=False,
     category="read"
 ))
@@ -98,13 +166,13 @@ register_tool(Tool(
 register_tool(Tool(
     name="search_emails",
     description="Search emails by various criteria. Returns a list of matching emails with summaries.",
-    parameters=[
+    parameters=(
         ToolParameter("query", "string", "Search keywords to find in subject or body", required=False),
         ToolParameter("sender", "string", "Filter by sender email or name", required=False),
-        ToolParameter("actionability", "string", "Filter by actionability", required=False, enum=["actionable", "informational", "noise"]),
+        ToolParameter("actionability", "string", "Filter by actionability", required=False, enum=("actionable", "informational", "noise")),
         ToolParameter("days_back", "integer", "Only search emails from last N days", required=False, default=7),
         ToolParameter("limit", "integer", "Maximum results to return", required=False, default=10)
-    ],
+    ),
     requires_approval=False,
     category="search"
 ))
@@ -112,9 +180,9 @@ register_tool(Tool(
 register_tool(Tool(
     name="get_email_thread",
     description="Get all emails in a conversation thread. Useful for understanding full context of a discussion.",
-    parameters=[
-        ToolParameter("thread_id", "string", "The thread ID to retrieve")
-    ],
+    parameters=(
+        ToolParameter("thread_id", "string", "The thread ID to retrieve"),
+    ),
     requires_approval=False,
     category="read"
 ))
@@ -122,9 +190,9 @@ register_tool(Tool(
 register_tool(Tool(
     name="read_task",
     description="Read details of a specific task by ID.",
-    parameters=[
-        ToolParameter("task_id", "string", "The unique task ID (e.g., 'tsk_xxx')")
-    ],
+    parameters=(
+        ToolParameter("task_id", "string", "The unique task ID (e.g., 'tsk_xxx')"),
+    ),
     requires_approval=False,
     category="read"
 ))
@@ -132,14 +200,14 @@ register_tool(Tool(
 register_tool(Tool(
     name="search_tasks",
     description="Search tasks by various criteria like priority, status, project, or keywords.",
-    parameters=[
+    parameters=(
         ToolParameter("query", "string", "Search keywords in task title or description", required=False),
-        ToolParameter("priority", "string", "Filter by priority", required=False, enum=["P0", "P1", "P2", "P3"]),
-        ToolParameter("status", "string", "Filter by status", required=False, enum=["todo", "in_progress", "completed", "blocked"]),
+        ToolParameter("priority", "string", "Filter by priority", required=False, enum=("P0", "P1", "P2", "P3")),
+        ToolParameter("status", "string", "Filter by status", required=False, enum=("todo", "in_progress", "completed", "blocked")),
         ToolParameter("project", "string", "Filter by project/client (e.g., 'acme', 'techvision')", required=False),
-        ToolParameter("due_filter", "string", "Filter by due date", required=False, enum=["overdue", "today", "this_week", "upcoming"]),
+        ToolParameter("due_filter", "string", "Filter by due date", required=False, enum=("overdue", "today", "this_week", "upcoming")),
         ToolParameter("limit", "integer", "Maximum results", required=False, default=10)
-    ],
+    ),
     requires_approval=False,
     category="search"
 ))
@@ -147,9 +215,9 @@ register_tool(Tool(
 register_tool(Tool(
     name="get_meeting",
     description="Get details of a specific meeting including participants, time, and transcript availability.",
-    parameters=[
-        ToolParameter("meeting_id", "string", "The unique meeting ID (e.g., 'mtg_xxx')")
-    ],
+    parameters=(
+        ToolParameter("meeting_id", "string", "The unique meeting ID (e.g., 'mtg_xxx')"),
+    ),
     requires_approval=False,
     category="read"
 ))
@@ -157,13 +225,13 @@ register_tool(Tool(
 register_tool(Tool(
     name="search_meetings",
     description="Search meetings by title, participants, or date range.",
-    parameters=[
+    parameters=(
         ToolParameter("query", "string", "Search keywords in meeting title", required=False),
         ToolParameter("participant", "string", "Filter by participant email", required=False),
         ToolParameter("date_from", "string", "Start date (ISO format YYYY-MM-DD)", required=False),
         ToolParameter("date_to", "string", "End date (ISO format YYYY-MM-DD)", required=False),
         ToolParameter("limit", "integer", "Maximum results", required=False, default=5)
-    ],
+    ),
     requires_approval=False,
     category="search"
 ))
@@ -171,9 +239,9 @@ register_tool(Tool(
 register_tool(Tool(
     name="get_meeting_transcript",
     description="Get the full transcript of a meeting. Use this to understand what was discussed.",
-    parameters=[
-        ToolParameter("meeting_id", "string", "The meeting ID to get transcript for")
-    ],
+    parameters=(
+        ToolParameter("meeting_id", "string", "The meeting ID to get transcript for"),
+    ),
     requires_approval=False,
     category="read"
 ))
@@ -181,9 +249,9 @@ register_tool(Tool(
 register_tool(Tool(
     name="get_meeting_mom",
     description="Get the Minutes of Meeting (MoM) for a meeting, including decisions, action items, and risks.",
-    parameters=[
-        ToolParameter("meeting_id", "string", "The meeting ID to get MoM for")
-    ],
+    parameters=(
+        ToolParameter("meeting_id", "string", "The meeting ID to get MoM for"),
+    ),
     requires_approval=False,
     category="read"
 ))
@@ -191,11 +259,11 @@ register_tool(Tool(
 register_tool(Tool(
     name="get_followups",
     description="Get pending follow-up items that need attention.",
-    parameters=[
-        ToolParameter("severity", "string", "Filter by severity", required=False, enum=["critical", "high", "medium", "low"]),
-        ToolParameter("entity_type", "string", "Filter by type", required=False, enum=["task", "email", "meeting"]),
+    parameters=(
+        ToolParameter("severity", "string", "Filter by severity", required=False, enum=("critical", "high", "medium", "low")),
+        ToolParameter("entity_type", "string", "Filter by type", required=False, enum=("task", "email", "meeting")),
         ToolParameter("limit", "integer", "Maximum results", required=False, default=10)
-    ],
+    ),
     requires_approval=False,
     category="read"
 ))
@@ -203,9 +271,9 @@ register_tool(Tool(
 register_tool(Tool(
     name="get_user_context",
     description="Get information about a user including their role, preferences, and communication style.",
-    parameters=[
-        ToolParameter("email", "string", "The user's email address")
-    ],
+    parameters=(
+        ToolParameter("email", "string", "The user's email address"),
+    ),
     requires_approval=False,
     category="read"
 ))
@@ -216,9 +284,9 @@ register_tool(Tool(
 register_tool(Tool(
     name="analyze_email",
     description="Use AI to analyze an email: categorize it, extract action items, identify urgency, and summarize content.",
-    parameters=[
-        ToolParameter("email_id", "string", "The email ID to analyze")
-    ],
+    parameters=(
+        ToolParameter("email_id", "string", "The email ID to analyze"),
+    ),
     requires_approval=False,
     category="analyze"
 ))
@@ -226,9 +294,9 @@ register_tool(Tool(
 register_tool(Tool(
     name="generate_meeting_summary",
     description="Use AI to generate a comprehensive summary of a meeting from its transcript.",
-    parameters=[
-        ToolParameter("meeting_id", "string", "The meeting ID to summarize")
-    ],
+    parameters=(
+        ToolParameter("meeting_id", "string", "The meeting ID to summarize"),
+    ),
     requires_approval=False,
     category="analyze"
 ))
@@ -236,10 +304,10 @@ register_tool(Tool(
 register_tool(Tool(
     name="analyze_priority",
     description="Analyze the priority and urgency of an email or task based on content, sender, and deadlines.",
-    parameters=[
-        ToolParameter("entity_type", "string", "Type of entity", enum=["email", "task"]),
+    parameters=(
+        ToolParameter("entity_type", "string", "Type of entity", enum=("email", "task")),
         ToolParameter("entity_id", "string", "The ID of the email or task to analyze")
-    ],
+    ),
     requires_approval=False,
     category="analyze"
 ))
@@ -247,11 +315,11 @@ register_tool(Tool(
 register_tool(Tool(
     name="find_related_context",
     description="Find related emails, tasks, and meetings for a given topic or entity. Useful for gathering context.",
-    parameters=[
+    parameters=(
         ToolParameter("topic", "string", "The topic or keywords to find context for"),
-        ToolParameter("entity_type", "string", "Optionally limit to entity type", required=False, enum=["email", "task", "meeting", "all"]),
+        ToolParameter("entity_type", "string", "Optionally limit to entity type", required=False, enum=("email", "task", "meeting", "all")),
         ToolParameter("limit", "integer", "Maximum results per type", required=False, default=5)
-    ],
+    ),
     requires_approval=False,
     category="search"
 ))
@@ -262,15 +330,15 @@ register_tool(Tool(
 register_tool(Tool(
     name="create_task",
     description="Create a new task. Use this when an email or meeting requires follow-up action.",
-    parameters=[
+    parameters=(
         ToolParameter("title", "string", "Task title (clear and actionable)"),
         ToolParameter("description", "string", "Detailed task description", required=False),
-        ToolParameter("priority", "string", "Task priority", enum=["P0", "P1", "P2", "P3"]),
+        ToolParameter("priority", "string", "Task priority", enum=("P0", "P1", "P2", "P3")),
         ToolParameter("due_date", "string", "Due date in ISO format (YYYY-MM-DD)", required=False),
-        ToolParameter("source_type", "string", "What created this task", enum=["email", "meeting", "manual", "agent"]),
+        ToolParameter("source_type", "string", "What created this task", enum=("email", "meeting", "manual", "agent")),
         ToolParameter("source_ref_id", "string", "Reference ID of source (email_id or meeting_id)", required=False),
         ToolParameter("tags", "array", "Tags for categorization (e.g., ['acme', 'urgent'])", required=False)
-    ],
+    ),
     requires_approval=True,
     category="write"
 ))
@@ -278,13 +346,13 @@ register_tool(Tool(
 register_tool(Tool(
     name="update_task",
     description="Update an existing task's status, priority, or other fields.",
-    parameters=[
+    parameters=(
         ToolParameter("task_id", "string", "The task ID to update"),
-        ToolParameter("status", "string", "New status", required=False, enum=["todo", "in_progress", "completed", "blocked"]),
-        ToolParameter("priority", "string", "New priority", required=False, enum=["P0", "P1", "P2", "P3"]),
+        ToolParameter("status", "string", "New status", required=False, enum=("todo", "in_progress", "completed", "blocked")),
+        ToolParameter("priority", "string", "New priority", required=False, enum=("P0", "P1", "P2", "P3")),
         ToolParameter("due_date", "string", "New due date (ISO format)", required=False),
         ToolParameter("notes", "string", "Add notes to task", required=False)
-    ],
+    ),
     requires_approval=True,
     category="write"
 ))
@@ -292,12 +360,12 @@ register_tool(Tool(
 register_tool(Tool(
     name="draft_email_reply",
     description="Draft a reply to an email. The draft will be reviewed before sending.",
-    parameters=[
+    parameters=(
         ToolParameter("email_id", "string", "The email ID to reply to"),
-        ToolParameter("tone", "string", "Tone of the reply", enum=["professional", "friendly", "formal", "urgent"]),
+        ToolParameter("tone", "string", "Tone of the reply", enum=("professional", "friendly", "formal", "urgent")),
         ToolParameter("key_points", "array", "Key points to include in the reply"),
         ToolParameter("include_context", "boolean", "Whether to include relevant context from meetings/tasks", required=False, default=True)
-    ],
+    ),
     requires_approval=True,
     category="communicate"
 ))
@@ -305,13 +373,13 @@ register_tool(Tool(
 register_tool(Tool(
     name="send_email",
     description="Send an email (either a draft reply or new email). ALWAYS requires approval.",
-    parameters=[
+    parameters=(
         ToolParameter("to_emails", "array", "List of recipient email addresses"),
         ToolParameter("subject", "string", "Email subject line"),
         ToolParameter("body", "string", "Email body content"),
         ToolParameter("reply_to_email_id", "string", "If replying, the original email ID", required=False),
         ToolParameter("cc_emails", "array", "CC recipients", required=False)
-    ],
+    ),
     requires_approval=True,
     category="communicate"
 ))
@@ -319,13 +387,13 @@ register_tool(Tool(
 register_tool(Tool(
     name="create_followup",
     description="Create a follow-up reminder for a task or email.",
-    parameters=[
-        ToolParameter("entity_type", "string", "Type of entity to follow up on", enum=["task", "email", "meeting"]),
+    parameters=(
+        ToolParameter("entity_type", "string", "Type of entity to follow up on", enum=("task", "email", "meeting")),
         ToolParameter("entity_id", "string", "ID of the entity"),
         ToolParameter("reason", "string", "Why follow-up is needed"),
         ToolParameter("due_date", "string", "When to follow up (ISO format)"),
-        ToolParameter("channel", "string", "Recommended follow-up channel", enum=["email", "chat", "call"])
-    ],
+        ToolParameter("channel", "string", "Recommended follow-up channel", enum=("email", "chat", "call"))
+    ),
     requires_approval=True,
     category="write"
 ))
@@ -333,13 +401,13 @@ register_tool(Tool(
 register_tool(Tool(
     name="schedule_meeting",
     description="Schedule a new meeting with participants.",
-    parameters=[
+    parameters=(
         ToolParameter("title", "string", "Meeting title"),
         ToolParameter("description", "string", "Meeting description/agenda", required=False),
         ToolParameter("participants", "array", "List of participant emails"),
         ToolParameter("proposed_times", "array", "List of proposed time slots (ISO datetime strings)"),
         ToolParameter("duration_minutes", "integer", "Meeting duration in minutes", default=30)
-    ],
+    ),
     requires_approval=True,
     category="communicate"
 ))
@@ -347,11 +415,11 @@ register_tool(Tool(
 register_tool(Tool(
     name="mark_email_processed",
     description="Mark an email as processed by the agent. Use this after completing all actions for an email.",
-    parameters=[
+    parameters=(
         ToolParameter("email_id", "string", "The email ID to mark as processed"),
         ToolParameter("actions_taken", "array", "List of actions taken on this email"),
-        ToolParameter("category", "string", "Final category assigned", enum=["actionable", "informational", "noise", "delegated"])
-    ],
+        ToolParameter("category", "string", "Final category assigned", enum=("actionable", "informational", "noise", "delegated"))
+    ),
     requires_approval=False,  # Low risk - just marking status
     category="write"
 ))
@@ -362,9 +430,9 @@ register_tool(Tool(
 register_tool(Tool(
     name="think",
     description="Use this to record your thinking process. Helps with complex reasoning.",
-    parameters=[
-        ToolParameter("thought", "string", "Your reasoning or analysis")
-    ],
+    parameters=(
+        ToolParameter("thought", "string", "Your reasoning or analysis"),
+    ),
     requires_approval=False,
     category="meta"
 ))
@@ -372,11 +440,11 @@ register_tool(Tool(
 register_tool(Tool(
     name="finish",
     description="Signal that you have completed the task. Provide a summary of what was done.",
-    parameters=[
+    parameters=(
         ToolParameter("summary", "string", "Summary of actions taken"),
         ToolParameter("actions_completed", "array", "List of completed actions"),
         ToolParameter("pending_approvals", "array", "List of actions waiting for approval", required=False)
-    ],
+    ),
     requires_approval=False,
     category="meta"
 ))
@@ -384,11 +452,11 @@ register_tool(Tool(
 register_tool(Tool(
     name="request_human_input",
     description="Request clarification or input from the user when you're unsure how to proceed.",
-    parameters=[
+    parameters=(
         ToolParameter("question", "string", "The question or clarification needed"),
         ToolParameter("options", "array", "Suggested options for the user to choose from", required=False),
         ToolParameter("context", "string", "Why you need this input", required=False)
-    ],
+    ),
     requires_approval=False,
     category="meta"
 ))
@@ -398,9 +466,72 @@ register_tool(Tool(
 # TOOL EXECUTION ENGINE
 # ============================================================
 
+# Fields the search handlers match case-insensitively; DataRepo.lowered caches them per generation
+_EMAIL_SEARCH_FIELDS = ("subject", "body_text", "from_email")
+_TASK_SEARCH_FIELDS = ("title", "description", "tags")
+_MEETING_SEARCH_FIELDS = ("title", "participant_emails")
+
+
+def _email_hit(email: Dict) -> Dict:
+    return {
+        "email_id": email["email_id"],
+        "subject": email["subject"],
+        "from": email["from_email"],
+        "received": email.get("received_utc", ""),
+        "actionability": email.get("actionability_gt", "unknown"),
+        "preview": email.get("body_text", "")[:150] + "..."
+    }
+
+
+def _task_hit(task: Dict) -> Dict:
+    return {
+        "task_id": task["task_id"],
+        "title": task["title"],
+        "priority": task.get("priority", "P3"),
+        "status": task.get("status", "todo"),
+        "due_date": task.get("due_date_utc", "")[:10] if task.get("due_date_utc") else None,
+        "tags": task.get("tags", [])
+    }
+
+
+def _meeting_hit(mtg: Dict) -> Dict:
+    return {
+        "meeting_id": mtg["meeting_id"],
+        "title": mtg["title"],
+        "scheduled_start": mtg.get("scheduled_start_utc", ""),
+        "participants": mtg.get("participant_emails", []),
+        "has_transcript": bool(mtg.get("transcript_file"))
+    }
+
+
+# find_related_context sources: (entity_type, result key, dataset, search fields,
+# how many leading fields the topic is matched against, result summarizer)
+_RELATED_SOURCES = (
+    ("email", "emails", "inbox", _EMAIL_SEARCH_FIELDS, 2, _email_hit),
+    ("task", "tasks", "tasks", _TASK_SEARCH_FIELDS, 2, _task_hit),
+    ("meeting", "meetings", "meetings", _MEETING_SEARCH_FIELDS, 1, _meeting_hit),
+)
+
+
 class ToolExecutor:
     """Executes tools with the data repository and governance"""
     
+    # (tools_version, tool name -> unbound _exec_ handler), shared by all executors
+    _handler_table: Tuple[int, Dict[str, Callable[..., Dict]]] = (-1, {})
+    
+    @classmethod
+    def _handlers(cls) -> Dict[str, Callable[..., Dict]]:
+        """Handler table, rebuilt only when a tool is registered"""
+        version, table = cls._handler_table
+        if version != _tools_version:
+            table = {}
+            for name in TOOLS:
+                fn = getattr(cls, f"_exec_{name}", None)
+                if fn is not None:
+                    table[name] = fn
+            cls._handler_table = (_tools_version, table)
+        return table
+    
     def __init__(self, repo, gateway=None, user_email: str = "demo@awoa.local"):
         self.repo = repo
         self.gateway = gateway
@@ -409,11 +540,10 @@ class ToolExecutor:
     
     def execute(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a tool and return the result"""
-        if tool_name not in TOOLS:
+        tool = TOOLS.get(tool_name)
+        if tool is None:
             return {"success": False, "error": f"Unknown tool: {tool_name}"}
         
-        tool = TOOLS[tool_name]
-        
         # Log execution
         execution_id = f"exec_{uuid.uuid4().hex[:8]}"
         self._execution_log.append({
@@ -426,9 +556,9 @@ class ToolExecutor:
         
         # Route to appropriate handler
         try:
-            handler = getattr(self, f"_exec_{tool_name}", None)
+            handler = self._handlers().get(tool_name)
             if handler:
-                result = handler(parameters)
+                result = handler(self, parameters)
             else:
                 result = {"success": False, "error": f"No handler for tool: {tool_name}"}
             
@@ -439,6 +569,16 @@ class ToolExecutor:
                 "requires_approval": tool.requires_approval,
                 "result": result
             }
+        except KeyError as e:
+            # Validation happens only on this failure path: a missing required
+            # parameter surfaces as a KeyError from the handler
+            missing = sorted(_REQUIRED_PARAMS[tool_name].difference(parameters or ()))
+            return {
+                "success": False,
+                "execution_id": execution_id,
+                "tool": tool_name,
+                "error": f"Missing required parameter(s): {', '.join(missing)}" if missing else str(e)
+            }
         except Exception as e:
             return {
                 "success": False,
@@ -447,18 +587,21 @@ class ToolExecutor:
                 "error": str(e)
             }
     
+    def _search_rows(self, key: str, fields: Tuple[str, ...], query: str) -> List[Tuple[Dict, Tuple]]:
+        """Lowercased rows to scan for a query, narrowed by the repo's trigram index when possible"""
+        rows, candidates = self.repo.search_candidates(key, fields, query)
+        return rows if candidates is None else [rows[i] for i in candidates]
+    
     # --- READ HANDLERS ---
     
     def _exec_read_email(self, params: Dict) -> Dict:
         email_id = params["email_id"]
-        emails = self.repo.inbox()
-        email = next((e for e in emails if e.get("email_id") == email_id), None)
+        email = self.repo.email_by_id(email_id)
         if not email:
             return {"found": False, "error": f"Email {email_id} not found"}
         return {"found": True, "email": email}
     
     def _exec_search_emails(self, params: Dict) -> Dict:
-        emails = self.repo.inbox()
         results = []
         
         query = params.get("query", "").lower()
@@ -466,23 +609,16 @@ class ToolExecutor:
         actionability = params.get("actionability")
         limit = params.get("limit", 10)
         
-        for email in emails:
+        for email, (subject_lc, body_lc, from_lc) in self._search_rows("inbox", _EMAIL_SEARCH_FIELDS, query):
             # Apply filters
-            if query and query not in email.get("subject", "").lower() and query not in email.get("body_text", "").lower():
+            if query and query not in subject_lc and query not in body_lc:
                 continue
-            if sender and sender not in email.get("from_email", "").lower():
+            if sender and sender not in from_lc:
                 continue
             if actionability and email.get("actionability_gt") != actionability:
                 continue
             
-            results.append({
-                "email_id": email["email_id"],
-                "subject": email["subject"],
-                "from": email["from_email"],
-                "received": email.get("received_utc", ""),
-                "actionability": email.get("actionability_gt", "unknown"),
-                "preview": email.get("body_text", "")[:150] + "..."
-            })
+            results.append(_email_hit(email))
             
             if len(results) >= limit:
                 break
@@ -490,7 +626,6 @@ class ToolExecutor:
         return {"count": len(results), "emails": results}
     
     def _exec_search_tasks(self, params: Dict) -> Dict:
-        tasks = self.repo.tasks()
         results = []
         
         query = params.get("query", "").lower()
@@ -501,15 +636,15 @@ class ToolExecutor:
         
         today = date.today().isoformat()
         
-        for task in tasks:
+        for task, (title_lc, desc_lc, tags_lc) in self._search_rows("tasks", _TASK_SEARCH_FIELDS, query):
             # Apply filters
-            if query and query not in task.get("title", "").lower() and query not in (task.get("description") or "").lower():
+            if query and query not in title_lc and query not in desc_lc:
                 continue
             if priority and task.get("priority") != priority:
                 continue
             if status and task.get("status") != status:
                 continue
-            if project and project not in " ".join(task.get("tags", [])).lower() and project not in task.get("title", "").lower():
+            if project and project not in " ".join(tags_lc) and project not in title_lc:
                 continue
             
             # Due filter
@@ -521,14 +656,7 @@ class ToolExecutor:
                 elif due_filter == "today" and due_date != today:
                     continue
             
-            results.append({
-                "task_id": task["task_id"],
-                "title": task["title"],
-                "priority": task.get("priority", "P3"),
-                "status": task.get("status", "todo"),
-                "due_date": task.get("due_date_utc", "")[:10] if task.get("due_date_utc") else None,
-                "tags": task.get("tags", [])
-            })
+            results.append(_task_hit(task))
             
             if len(results) >= limit:
                 break
@@ -536,28 +664,19 @@ class ToolExecutor:
         return {"count": len(results), "tasks": results}
     
     def _exec_search_meetings(self, params: Dict) -> Dict:
-        meetings = self.repo.meetings()
         results = []
         
         query = params.get("query", "").lower()
         participant = params.get("participant", "").lower()
         limit = params.get("limit", 5)
         
-        for mtg in meetings:
-            if query and query not in mtg.get("title", "").lower():
+        for mtg, (title_lc, participants_lc) in self._search_rows("meetings", _MEETING_SEARCH_FIELDS, query):
+            if query and query not in title_lc:
+                continue
+            if participant and not any(participant in p for p in participants_lc):
                 continue
-            if participant:
-                participants = [p.lower() for p in mtg.get("participant_emails", [])]
-                if not any(participant in p for p in participants):
-                    continue
             
-            results.append({
-                "meeting_id": mtg["meeting_id"],
-                "title": mtg["title"],
-                "scheduled_start": mtg.get("scheduled_start_utc", ""),
-                "participants": mtg.get("participant_emails", []),
-                "has_transcript": bool(mtg.get("transcript_file"))
-            })
+            results.append(_meeting_hit(mtg))
             
             if len(results) >= limit:
                 break
@@ -566,8 +685,7 @@ class ToolExecutor:
     
     def _exec_get_meeting_transcript(self, params: Dict) -> Dict:
         meeting_id = params["meeting_id"]
-        meetings = self.repo.meetings()
-        mtg = next((m for m in meetings if m["meeting_id"] == meeting_id), None)
+        mtg = self.repo.meeting_by_id(meeting_id)
         
         if not mtg:
             return {"found": False, "error": f"Meeting {meeting_id} not found"}
@@ -586,8 +704,7 @@ class ToolExecutor:
     
     def _exec_get_meeting_mom(self, params: Dict) -> Dict:
         meeting_id = params["meeting_id"]
-        mom_entries = self.repo.mom_entries()
-        mom = next((m for m in mom_entries if m.get("meeting_id") == meeting_id), None)
+        mom = self.repo.mom_by_meeting_id(meeting_id)
         
         if not mom:
             return {"found": False, "meeting_id": meeting_id, "message": "No MoM found. Consider using generate_meeting_summary."}
@@ -625,24 +742,28 @@ class ToolExecutor:
         entity_type = params.get("entity_type", "all")
         limit = params.get("limit", 5)
         
-        results = {"topic": topic, "related": {}}
-        
-        # Search emails
-        if entity_type in ["all", "email"]:
-            emails = self._exec_search_emails({"query": topic, "limit": limit})
-            results["related"]["emails"] = emails.get("emails", [])
-        
-        # Search tasks
-        if entity_type in ["all", "task"]:
-            tasks = self._exec_search_tasks({"query": topic, "limit": limit})
-            results["related"]["tasks"] = tasks.get("tasks", [])
-        
-        # Search meetings
-        if entity_type in ["all", "meeting"]:
-            meetings = self._exec_search_meetings({"query": topic, "limit": limit})
-            results["related"]["meetings"] = meetings.get("meetings", [])
-        
-        return results
+        kinds = ("email", "task", "meeting") if entity_type == "all" else (entity_type,)
+        return {"topic": topic, "related": self._search_all(topic, limit, kinds)}
+    
+    def _search_all(self, topic: str, limit: int, kinds) -> Dict[str, List[Dict]]:
+        """
+        The topic-only subset of search_emails/tasks/meetings, one pass per
+        requested collection, without building params or dispatching per search
+        """
+        take = max(limit, 1)  # the search handlers append before checking the limit
+        related = {}
+        for kind, result_key, key, fields, n_matched, hit in _RELATED_SOURCES:
+            if kind not in kinds:
+                continue
+            found = []
+            for record, values in self._search_rows(key, fields, topic):
+                if topic and not any(topic in v for v in values[:n_matched]):
+                    continue
+                found.append(hit(record))
+                if len(found) >= take:
+                    break
+            related[result_key] = found
+        return related
     
     # --- META HANDLERS ---
     
@@ -782,6 +903,16 @@ def get_tools_for_llm() -> List[Dict[str, Any]]:
     return [tool.to_openai_schema() for tool in TOOLS.values()]
 
 
+def get_tool_summaries() -> List[Dict[str, str]]:
+    """Compact name/description pairs for every tool, for prompts that promote schemas on demand"""
+    return [tool.to_summary() for tool in TOOLS.values()]
+
+
+def get_tool_schemas(names: Iterable[str]) -> List[Dict[str, Any]]:
+    """Full OpenAI schemas for just the named tools; unknown names are skipped"""
+    return [TOOLS[name].to_openai_schema() for name in names if name in TOOLS]
+
+
 def get_tool_names() -> List[str]:
     """Get list of all tool names"""
     return list(TOOLS.keys())
@@ -789,4 +920,4 @@ def get_tool_names() -> List[str]:
 
 def get_approval_required_tools() -> List[str]:
     """Get tools that require human approval"""
-    return [name for name, tool in TOOLS.items() if tool.requires_approval]
+    return list(_APPROVAL_TOOLS)
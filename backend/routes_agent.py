@@ -1,4 +1,4 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Response
 from typing import Dict, Any, List
 from backend.models import ProcessResponse, AgentEvent
 import anyio
@@ -9,17 +9,17 @@ router = APIRouter()
 
 # We'll try to use existing agent modules if available
 try:
-    from agents.autonomous_inbox import get_processor, get_processor_state, process_email_immediately
+    from agents.autonomous_inbox import get_processor, get_processor_state, get_processor_state_json, process_email_immediately
+    from agents.react_agent import ReActAgent, aprocess_email_sync
     AGENTS_AVAILABLE = True
 except Exception:
     AGENTS_AVAILABLE = False
 
 @router.get('/agent/status')
-async def agent_status() -> Dict[str, Any]:
+async def agent_status():
     if not AGENTS_AVAILABLE:
         return {"is_running": False, "info": "agents not available in this environment"}
-    state = get_processor_state()
-    return state
+    return Response(content=get_processor_state_json(), media_type="application/json")
 
 @router.post('/agent/start')
 async def agent_start():
@@ -34,7 +34,8 @@ async def agent_stop():
     if not AGENTS_AVAILABLE:
         raise HTTPException(status_code=500, detail='Agent modules not available')
     proc = get_processor()
-    proc.stop()
+    # stop() waits (bounded) for in-flight emails; keep that off the event loop
+    await anyio.to_thread.run_sync(proc.stop)
     return {"status": "stopped"}
 
 @router.post('/agent/process-email')
@@ -48,6 +49,26 @@ async def process_email(payload: Dict[str, str], background_tasks: BackgroundTas
     background_tasks.add_task(worker.schedule_email_processing, email_id)
     return ProcessResponse(task_id=email_id, status='processing', summary='Scheduled for background processing')
 
+@router.post('/agent/process-email/sync')
+async def process_email_sync(payload: Dict[str, str], api_key: str = Depends(get_api_key)):
+    # payload: {"email_id": "..."}; runs the ReAct agent now and returns its final state
+    if not AGENTS_AVAILABLE:
+        raise HTTPException(status_code=500, detail='Agent modules not available')
+    email_id = payload.get('email_id')
+    if not email_id:
+        raise HTTPException(status_code=400, detail='email_id required')
+    proc = get_processor()
+    email = proc.repo.email_by_id(email_id)
+    if not email:
+        raise HTTPException(status_code=404, detail='email not found')
+    agent = ReActAgent(repo=proc.repo, gateway=proc.gateway, user_email=proc.user_email)
+    try:
+        state = await aprocess_email_sync(agent, email)
+    finally:
+        agent.close()
+    # Encoded straight from the columnar trace, no per-step row dicts
+    return Response(content=state.to_json_bytes(), media_type="application/json")
+
 # Simple events polling endpoint (frontend can poll recent events)
 @router.get('/agent/events', response_model=List[AgentEvent])
 async def agent_events():
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from typing import List, Dict, Any, Optional
 from repos.data_repo import DataRepo
 from agents.tasks_agent import TasksAgent
@@ -11,6 +11,7 @@ from orchestration import chat_workflow
 from app.smart_chat import SmartChatAgent
 from config.settings import SETTINGS
 import json
+import anyio
 
 router = APIRouter()
 
@@ -335,9 +336,8 @@ async def run_proactive_check(payload: dict):
 async def autonomous_agent_status():
     """Get status of autonomous inbox processor"""
     try:
-        from agents.autonomous_inbox import get_processor_state
-        state = get_processor_state()
-        return state
+        from agents.autonomous_inbox import get_processor_state_json
+        return Response(content=get_processor_state_json(), media_type="application/json")
     except ImportError:
         return {"is_running": False, "info": "autonomous module not available"}
 
@@ -360,7 +360,8 @@ async def stop_autonomous_processor():
     try:
         from agents.autonomous_inbox import get_processor
         processor = get_processor()
-        processor.stop()
+        # stop() waits (bounded) for in-flight emails; keep that off the event loop
+        await anyio.to_thread.run_sync(processor.stop)
         return {"status": "stopped"}
     except ImportError:
         raise HTTPException(status_code=500, detail="autonomous module not available")
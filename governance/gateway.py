@@ -1,7 +1,8 @@
 
 from __future__ import annotations
 import re, time, json
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 from config.settings import SETTINGS
 from governance.usage import write_usage
 
@@ -22,6 +23,17 @@ except Exception:
 # Load policies once
 POLICIES = json.loads(SETTINGS["governance"]["policies_file"].read_text())
 DAILY_BUDGET_DEFAULT = SETTINGS["governance"]["daily_budget_usd"]
+# In-flight requests per batch_call_llm
+BATCH_MAX_WORKERS = 16
+
+# Simulated MoM: per-line transcript scans
+_SPEAKER_NAMED_RE = re.compile(r'Speaker \d+ \(([^)]+)\):')
+_SPEAKER_NAMED_PREFIX_RE = re.compile(r'^Speaker \d+ \([^)]+\):\s*')
+_SPEAKER_PREFIX_RE = re.compile(r'^Speaker \d+:\s*')
+_DECISION_KW = ("decided", "agreed", "approved", "confirmed", "let's do", "we'll go with", "that's the plan")
+_ACTION_KW = ("i'll", "we'll", "will send", "by friday", "by end of", "i will", "we will", "let me", "i can have")
+_RISK_KW = ("risk", "concern", "worried", "might be", "could fail", "blocker", "delay", "tight", "challenge")
+_DEPENDENCY_KW = ("need access", "waiting for", "depends on", "requires", "need from", "connect you")
 
 def _redact(text: str) -> str:
     masks = POLICIES.get("pii_redaction_regex", {})
@@ -126,6 +138,59 @@ class PolicyGateway:
                             correlation_id=correlation_id, meta={"error": str(e)})
                 raise
 
+    def stream_llm(self, prompt: str, temperature: float = 0.2,
+                   max_tokens: int = 1024, correlation_id: Optional[str] = None) -> Iterator[str]:
+        """
+        Yield the response text as it arrives. Without a streaming backend
+        (simulation / legacy path) the whole response comes as one chunk.
+        """
+        if self._enhanced:
+            started = False
+            try:
+                out = self._enhanced.call(
+                    prompt=prompt,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    correlation_id=correlation_id,
+                    stream=True
+                )
+                if isinstance(out, str):
+                    yield out
+                    return
+                for chunk in out:
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started:
+                    raise
+                print(f"⚠️  Enhanced gateway streaming failed, falling back to legacy: {e}")
+        yield self.call_llm(prompt, temperature=temperature, max_tokens=max_tokens,
+                            correlation_id=correlation_id)
+
+    def batch_call_llm(self, prompts: List[str], temperature: float = 0.2,
+                       max_tokens: int = 1024,
+                       correlation_ids: Optional[List[Optional[str]]] = None) -> List[Union[str, Exception]]:
+        """
+        Issue several independent prompts at once. Requests go out concurrently
+        so the proxy / model server can batch them; each still passes through
+        call_llm's policy, cache and usage logging. Results are in prompt order,
+        with a failed prompt's exception in its slot instead of a string.
+        """
+        if not prompts:
+            return []
+        ids = correlation_ids or [None] * len(prompts)
+        
+        def one(i: int) -> Union[str, Exception]:
+            try:
+                return self.call_llm(prompts[i], temperature=temperature,
+                                     max_tokens=max_tokens, correlation_id=ids[i])
+            except Exception as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=min(len(prompts), BATCH_MAX_WORKERS)) as pool:
+            return list(pool.map(one, range(len(prompts))))
+
         # Add this helper method inside PolicyGateway class:
     def _simulate_response(self, prompt: str) -> str:
         """
@@ -281,7 +346,7 @@ class PolicyGateway:
         # Extract participants from "Speaker X (Name, Company):" patterns
         participants = set()
         for line in lines:
-            match = re.match(r'Speaker \d+ \(([^)]+)\):', line)
+            match = _SPEAKER_NAMED_RE.match(line)
             if match:
                 participants.add(match.group(1).split(',')[0].strip())
         
@@ -298,26 +363,26 @@ class PolicyGateway:
         for line in lines:
             line_lower = line.lower()
             # Clean up speaker prefix for all extractions
-            clean = re.sub(r'^Speaker \d+ \([^)]+\):\s*', '', line).strip()
-            clean = re.sub(r'^Speaker \d+:\s*', '', clean).strip()
+            clean = _SPEAKER_NAMED_PREFIX_RE.sub('', line).strip()
+            clean = _SPEAKER_PREFIX_RE.sub('', clean).strip()
             
             # Look for decisions (keywords: decided, agreed, approved, confirmed, let's do)
-            if any(kw in line_lower for kw in ['decided', 'agreed', 'approved', 'confirmed', "let's do", 'we\'ll go with', 'that\'s the plan']):
+            if any(kw in line_lower for kw in _DECISION_KW):
                 if clean and len(clean) > 20:
                     decisions.append(clean[:200])
             
             # Look for action items (keywords: I'll, we'll, will send, by Friday, by end of, need to)
-            if any(kw in line_lower for kw in ["i'll", "we'll", "will send", "by friday", "by end of", "i will", "we will", "let me", "i can have"]):
+            if any(kw in line_lower for kw in _ACTION_KW):
                 if clean and len(clean) > 15:
                     action_items.append(clean[:200])
             
             # Look for risks (keywords: risk, concern, worried, might, could fail, blocker, delay)
-            if any(kw in line_lower for kw in ['risk', 'concern', 'worried', 'might be', 'could fail', 'blocker', 'delay', 'tight', 'challenge']):
+            if any(kw in line_lower for kw in _RISK_KW):
                 if clean and len(clean) > 15:
                     risks.append(clean[:200])
             
             # Look for dependencies (keywords: need access, waiting for, depends on, requires)
-            if any(kw in line_lower for kw in ['need access', 'waiting for', 'depends on', 'requires', 'need from', 'connect you']):
+            if any(kw in line_lower for kw in _DEPENDENCY_KW):
                 if clean and len(clean) > 15:
                     dependencies.append(clean[:200])
         
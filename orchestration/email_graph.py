@@ -13,12 +13,12 @@ class EmailAgent:
         self.gw = PolicyGateway("email_agent")
 
     def _summarize(self, email: Dict[str, Any]) -> str:
-        p = prompts.EMAIL_SUMMARY_PROMPT.format(subject=email["subject"], body=email["body_text"])
+        p = prompts.render_email_summary(subject=email["subject"], body=email["body_text"])
         return self.gw.call_llm(p, correlation_id=email.get("correlation_id"))
 
     def _extract_actions(self, email: Dict[str, Any]) -> List[ExtractedAction]:
         # For Phase-1, try LLM; fallback to trivial heuristic (look for "by <date>" patterns)
-        p = prompts.EMAIL_ACTIONS_PROMPT.format(subject=email["subject"], body=email["body_text"])
+        p = prompts.render_email_actions(subject=email["subject"], body=email["body_text"])
         text = self.gw.call_llm(p, correlation_id=email.get("correlation_id"))
         # Lenient parse (LLM-simulated path returns plain text) -> keep empty list on failure
         try:
@@ -29,7 +29,7 @@ class EmailAgent:
             return []
 
     def _draft_reply(self, email: Dict[str, Any], user_ctx: Dict[str, Any]) -> str:
-        p = prompts.EMAIL_REPLY_PROMPT.format(
+        p = prompts.render_email_reply(
             tone=user_ctx.get("communication_tone","neutral"),
             from_email=email["from_email"],
             subject=email["subject"],
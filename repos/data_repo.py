@@ -1,8 +1,13 @@
 
 from __future__ import annotations
 import json
+import os
+import threading
+import time
 import uuid
-from typing import Any, Dict, List, Optional
+from collections import defaultdict
+from functools import wraps
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from pathlib import Path
 from datetime import datetime
 from config.settings import SETTINGS
@@ -14,11 +19,35 @@ def _load_json(path: Path) -> Any:
     except Exception as e:
         raise RuntimeError(f"Failed to load {path}: {e}")
 
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it can't be stat'ed"""
+    try:
+        st = path.stat()
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+def _lower_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(str(v).lower() for v in value)
+    return str(value).lower() if value else ""
+
+# Seconds a cached dataset is trusted before its file is re-stat'ed for outside edits
+CACHE_TTL = float(os.getenv("DATA_CACHE_TTL", "5"))
+
 def _save_json(path: Path, data: Any) -> None:
     """Save data to JSON file"""
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
 
+def _locked(method):
+    """Run a DataRepo method under the repo lock (cache access and load-modify-save)"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class DataRepo:
     def __init__(self):
         d = SETTINGS["data"]
@@ -36,16 +65,123 @@ class DataRepo:
             "audit_log": d["governance"]["audit_log"],
             "llm_usage": d["governance"]["llm_usage"],
         }
+        # Guards the cache and every load-modify-save; reentrant since writes invalidate
+        self._lock = threading.RLock()
         # Cache
         self._cache = {}
-
-    def _get(self, key: str):
-        if key in self._cache: return self._cache[key]
+        # key -> (monotonic time of last check, file stamp at load)
+        self._stamps: Dict[str, Tuple[float, Optional[Tuple[int, int]]]] = {}
+        # Per-key generation, bumped on invalidation so callers can key derived indexes on it
+        self._versions: Dict[str, int] = {}
+        # (key, id_field) -> (generation, id -> record)
+        self._indexes: Dict[Tuple[str, str], Tuple[int, Dict[str, Dict[str, Any]]]] = {}
+        # (generation, email -> user_ids)
+        self._users_by_email: Optional[Tuple[int, Dict[str, List[str]]]] = None
+        # (key, fields) -> (generation, [(record, lowercased field values)])
+        self._lowered: Dict[Tuple[str, Tuple[str, ...]], Tuple[int, List[Tuple[Dict[str, Any], Tuple[Any, ...]]]]] = {}
+        # (key, fields) -> (generation, trigram -> positions in lowered(key, fields))
+        self._trigrams: Dict[Tuple[str, Tuple[str, ...]], Tuple[int, Dict[str, Set[int]]]] = {}
+        # (generation, [(task, lowercased "description title")])
+        self._task_blobs: Optional[Tuple[int, List[Tuple[Dict[str, Any], str]]]] = None
+
+    @_locked
+    def _get(self, key: str, revalidate: bool = False):
+        if key in self._cache:
+            if not self._stale(key, revalidate): return self._cache[key]
+            self.invalidate_cache(key)
         path = self.paths[key]
         data = _load_json(path) if path.suffix == ".json" else path
         self._cache[key] = data
+        self._stamps[key] = (time.monotonic(), _file_stamp(path))
         return data
 
+    def _stale(self, key: str, force: bool = False) -> bool:
+        """
+        True when a cached dataset's file changed on disk since it was loaded.
+        Within CACHE_TTL of the last check the cache is trusted without a stat
+        (unless force), so a report run re-reading tasks/inbox many times costs
+        one load.
+        """
+        stamp = self._stamps.get(key)
+        if stamp is None:
+            return False
+        checked, loaded = stamp
+        now = time.monotonic()
+        if not force and now - checked < CACHE_TTL:
+            return False
+        current = _file_stamp(self.paths[key])
+        self._stamps[key] = (now, loaded)
+        return current != loaded
+
+    @_locked
+    def _index(self, key: str, id_field: str) -> Dict[str, Dict[str, Any]]:
+        """id -> record for a dataset, rebuilt only when its generation changes"""
+        items = self._get(key)  # may reload, bumping the generation, if the file changed
+        ver = self.version(key)
+        hit = self._indexes.get((key, id_field))
+        if hit is None or hit[0] != ver:
+            # reversed() so the first record wins on duplicate ids, like a linear scan
+            hit = (ver, {it[id_field]: it for it in reversed(items) if id_field in it})
+            self._indexes[(key, id_field)] = hit
+        return hit[1]
+
+    @_locked
+    def lowered(self, key: str, fields: Tuple[str, ...]) -> List[Tuple[Dict[str, Any], Tuple[Any, ...]]]:
+        """
+        (record, lowercased values of fields) pairs for case-insensitive search,
+        rebuilt per generation. Missing/None values become "", list values a
+        tuple of lowercased items.
+        """
+        items = self._get(key)
+        ver = self.version(key)
+        hit = self._lowered.get((key, fields))
+        if hit is None or hit[0] != ver:
+            hit = (ver, [(it, tuple(_lower_value(it.get(f)) for f in fields)) for it in items])
+            self._lowered[(key, fields)] = hit
+        return hit[1]
+
+    @_locked
+    def trigram_candidates(self, key: str, fields: Tuple[str, ...], query: str) -> Optional[List[int]]:
+        """
+        Positions in lowered(key, fields) whose string fields contain every
+        trigram of the lowercased query, in record order. A superset of the
+        substring matches, so callers still verify; None for queries shorter
+        than three characters, which the index can't narrow.
+        """
+        if len(query) < 3:
+            return None
+        rows = self.lowered(key, fields)
+        ver = self.version(key)
+        hit = self._trigrams.get((key, fields))
+        if hit is None or hit[0] != ver:
+            index: Dict[str, Set[int]] = defaultdict(set)
+            for pos, (_, values) in enumerate(rows):
+                for value in values:
+                    if isinstance(value, str):
+                        for i in range(len(value) - 2):
+                            index[value[i:i + 3]].add(pos)
+            hit = (ver, dict(index))
+            self._trigrams[(key, fields)] = hit
+        postings = []
+        for i in range(len(query) - 2):
+            posting = hit[1].get(query[i:i + 3])
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        return sorted(postings[0].intersection(*postings[1:]))
+
+    @_locked
+    def search_candidates(self, key: str, fields: Tuple[str, ...],
+                          query: str) -> Tuple[List[Tuple[Dict[str, Any], Tuple[Any, ...]]], Optional[List[int]]]:
+        """
+        (lowered(key, fields), trigram_candidates(key, fields, query)) taken
+        under one lock, so the positions always index the rows returned. An
+        empty query gives None candidates.
+        """
+        rows = self.lowered(key, fields)
+        return rows, (self.trigram_candidates(key, fields, query) if query else None)
+
     # Users
     def users(self) -> List[Dict[str, Any]]:
         return self._get("users")
@@ -53,21 +189,66 @@ class DataRepo:
     def user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         return next((u for u in self.users() if u.get("email") == email), None)
 
+    @_locked
+    def user_ids_by_email(self, email: str) -> List[str]:
+        """user_ids registered under an email (usually one), from a per-generation index"""
+        users = self._get("users")
+        ver = self.version("users")
+        if self._users_by_email is None or self._users_by_email[0] != ver:
+            by_email: Dict[str, List[str]] = defaultdict(list)
+            for u in users:
+                by_email[u.get("email")].append(u["user_id"])
+            self._users_by_email = (ver, dict(by_email))
+        return self._users_by_email[1].get(email, [])
+
     # Emails
     def inbox(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         items = self._get("inbox")
         return self._apply_filters(items, filters or {})
 
+    def email_by_id(self, email_id: str) -> Optional[Dict[str, Any]]:
+        return self._index("inbox", "email_id").get(email_id)
+
+    def email_index(self) -> Dict[str, Dict[str, Any]]:
+        """Current id -> email map; shared with the repo, so treat it as read-only"""
+        return self._index("inbox", "email_id")
+
     # Tasks
     def tasks(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         items = self._get("tasks")
         return self._apply_filters(items, filters or {})
 
+    def task_by_id(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self._index("tasks", "task_id").get(task_id)
+
+    def task_index(self) -> Dict[str, Dict[str, Any]]:
+        """Current id -> task map; shared with the repo, so treat it as read-only"""
+        return self._index("tasks", "task_id")
+
+    def tasks_by_ids(self, task_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """id -> task for the ids that exist; one index fetch for the whole batch"""
+        idx = self._index("tasks", "task_id")
+        return {tid: idx[tid] for tid in task_ids if tid in idx}
+
+    @_locked
+    def task_search_blobs(self) -> List[Tuple[Dict[str, Any], str]]:
+        """(task, lowercased description + title) pairs for substring search, rebuilt per generation"""
+        items = self._get("tasks")
+        ver = self.version("tasks")
+        if self._task_blobs is None or self._task_blobs[0] != ver:
+            self._task_blobs = (ver, [
+                (t, (t.get("description", "") + " " + t.get("title", "")).lower()) for t in items
+            ])
+        return self._task_blobs[1]
+
     # Meetings & Transcripts & MoM
     def meetings(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         items = self._get("meetings")
         return self._apply_filters(items, filters or {})
 
+    def meeting_by_id(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        return self._index("meetings", "meeting_id").get(meeting_id)
+
     def get_transcript(self, transcript_file: Optional[str]) -> str:
         if not transcript_file or not isinstance(transcript_file, str):
             return ""
@@ -81,6 +262,11 @@ class DataRepo:
         mom = self._get("mom")
         return mom if isinstance(mom, list) else []
 
+    def mom_by_meeting_id(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        if not self.mom_entries():
+            return None
+        return self._index("mom", "meeting_id").get(meeting_id)
+
     # Followups & Reporting
     def followups(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         return self._apply_filters(self._get("followups"), filters or {})
@@ -108,15 +294,26 @@ class DataRepo:
     # WRITE OPERATIONS (for Agentic AI)
     # ============================================================
 
+    @_locked
     def invalidate_cache(self, key: Optional[str] = None) -> None:
         """Clear cache to force reload from disk"""
         if key:
             self._cache.pop(key, None)
+            self._stamps.pop(key, None)
+            self._versions[key] = self._versions.get(key, 0) + 1
         else:
             self._cache.clear()
+            self._stamps.clear()
+            for k in self.paths:
+                self._versions[k] = self._versions.get(k, 0) + 1
+
+    def version(self, key: str) -> int:
+        """Generation of a cached dataset; changes whenever it is invalidated"""
+        return self._versions.get(key, 0)
 
     # --- Email Operations ---
     
+    @_locked
     def add_email_to_inbox(self, email: Dict[str, Any]) -> Dict[str, Any]:
         """Add a new email to inbox (for demo sender portal)"""
         emails = _load_json(self.paths["inbox"]) or []
@@ -136,12 +333,27 @@ class DataRepo:
         self.invalidate_cache("inbox")
         return email
 
+    @_locked
+    def inbox_generation(self) -> Tuple[int, int, int]:
+        """
+        Cheap change token for the inbox: in-process generation plus the file's
+        mtime/size, so writes from other processes are noticed too. Reads don't
+        move it; only writes and reloads after an outside edit do.
+        """
+        # Drop a copy that an outside edit made stale now, so the reload in
+        # get_unprocessed_emails doesn't move the token after it is taken
+        if "inbox" in self._cache and self._stale("inbox", force=True):
+            self.invalidate_cache("inbox")
+        return (self.version("inbox"),) + (_file_stamp(self.paths["inbox"]) or (0, 0))
+
+    @_locked
     def get_unprocessed_emails(self) -> List[Dict[str, Any]]:
         """Get emails that haven't been processed by agent yet"""
-        self.invalidate_cache("inbox")  # Always fresh
-        emails = self.inbox()
+        # Always fresh: re-stat now, but only reload (and bump the generation) if the file changed
+        emails = self._get("inbox", revalidate=True)
         return [e for e in emails if not e.get("processed", False)]
 
+    @_locked
     def mark_email_processed(self, email_id: str, actions_taken: List[str], category: str) -> bool:
         """Mark an email as processed by the agent"""
         emails = _load_json(self.paths["inbox"]) or []
@@ -157,6 +369,35 @@ class DataRepo:
                 return True
         return False
 
+    @_locked
+    def mark_emails_processed_batch(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Mark several emails as processed with a single read/write of the inbox.
+        Each item: {"email_id", "actions_taken", "category"}. Returns count marked.
+        """
+        if not items:
+            return 0
+        updates = {it["email_id"]: it for it in items}
+        emails = _load_json(self.paths["inbox"]) or []
+        now = datetime.utcnow().isoformat()
+        
+        marked = 0
+        for email in emails:
+            it = updates.get(email.get("email_id"))
+            if it is None:
+                continue
+            email["processed"] = True
+            email["processed_utc"] = now
+            email["agent_actions"] = it.get("actions_taken", [])
+            email["agent_category"] = it.get("category", "processed")
+            marked += 1
+        
+        if marked:
+            _save_json(self.paths["inbox"], emails)
+            self.invalidate_cache("inbox")
+        return marked
+
+    @_locked
     def update_email(self, email_id: str, updates: Dict[str, Any]) -> bool:
         """Update email fields"""
         emails = _load_json(self.paths["inbox"]) or []
@@ -172,6 +413,7 @@ class DataRepo:
 
     # --- Task Operations ---
     
+    @_locked
     def create_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new task"""
         tasks = _load_json(self.paths["tasks"]) or []
@@ -189,6 +431,7 @@ class DataRepo:
         self.invalidate_cache("tasks")
         return task
 
+    @_locked
     def update_task(self, task_id: str, updates: Dict[str, Any]) -> bool:
         """Update an existing task"""
         tasks = _load_json(self.paths["tasks"]) or []
@@ -202,6 +445,7 @@ class DataRepo:
                 return True
         return False
 
+    @_locked
     def delete_task(self, task_id: str) -> bool:
         """Delete a task"""
         tasks = _load_json(self.paths["tasks"]) or []
@@ -216,6 +460,7 @@ class DataRepo:
 
     # --- Follow-up Operations ---
     
+    @_locked
     def get_followups(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all follow-ups, optionally filtered by status"""
         followups = _load_json(self.paths["followups"]) or []
@@ -223,6 +468,7 @@ class DataRepo:
             followups = [f for f in followups if f.get("status") == status]
         return followups
     
+    @_locked
     def create_followup(self, followup: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new follow-up"""
         followups = _load_json(self.paths["followups"]) or []
@@ -239,6 +485,7 @@ class DataRepo:
         self.invalidate_cache("followups")
         return followup
 
+    @_locked
     def update_followup(self, followup_id: str, updates: Dict[str, Any]) -> bool:
         """Update a follow-up"""
         followups = _load_json(self.paths["followups"]) or []
@@ -254,6 +501,7 @@ class DataRepo:
 
     # --- Meeting Operations ---
     
+    @_locked
     def create_meeting(self, meeting: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new meeting"""
         meetings = _load_json(self.paths["meetings"]) or []
@@ -270,6 +518,7 @@ class DataRepo:
 
     # --- Draft Storage ---
     
+    @_locked
     def save_draft(self, draft_type: str, draft: Dict[str, Any]) -> Dict[str, Any]:
         """Save a draft (email reply, etc.) for review"""
         drafts_path = self.paths.get("drafts")
@@ -290,6 +539,7 @@ class DataRepo:
         _save_json(drafts_path, drafts)
         return draft
 
+    @_locked
     def get_drafts(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get drafts, optionally filtered by status"""
         drafts_path = self.paths.get("drafts")
@@ -302,6 +552,7 @@ class DataRepo:
             drafts = [d for d in drafts if d.get("status") == status]
         return drafts
 
+    @_locked
     def update_draft(self, draft_id: str, updates: Dict[str, Any]) -> bool:
         """Update a draft"""
         drafts_path = self.paths.get("drafts")
@@ -0,0 +1,151 @@
+"""
+Autonomous Inbox Processor Tests
+================================
+Focused tests for the processor's polling and write paths, run against a
+DataRepo pointed at temporary JSON files (no LLM; email processing is
+stubbed out).
+
+Run with: python -m pytest tests/test_autonomous_inbox.py
+"""
+
+import sys
+import json
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from repos.data_repo import DataRepo
+from agents.autonomous_inbox import AutonomousInboxProcessor
+
+
+def _email(email_id: str, processed: bool = False) -> dict:
+    return {
+        "email_id": email_id,
+        "from_email": "sender@contoso.com",
+        "subject": f"Subject {email_id}",
+        "body_text": "Please review.",
+        "received_utc": "2025-01-01T00:00:00",
+        "processed": processed,
+    }
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = DataRepo()
+    for key in ("inbox", "tasks", "followups"):
+        repo.paths[key] = tmp_path / f"{key}.json"
+        repo.paths[key].write_text("[]", encoding="utf-8")
+    repo.paths["inbox"].write_text(json.dumps([_email("eml_1")]), encoding="utf-8")
+    return repo
+
+
+@pytest.fixture
+def processor(repo, monkeypatch):
+    processor = AutonomousInboxProcessor(repo=repo, use_langgraph=False)
+    processed = []
+    monkeypatch.setattr(processor, "_process_single_email", lambda email: processed.append(email["email_id"]))
+    processor.processed = processed
+    return processor
+
+
+def _count_scans(repo, monkeypatch) -> list:
+    scans = []
+    original = repo.get_unprocessed_emails
+
+    def counting():
+        scans.append(1)
+        return original()
+
+    monkeypatch.setattr(repo, "get_unprocessed_emails", counting)
+    return scans
+
+
+def test_idle_polls_skip_the_inbox_scan(repo, processor, monkeypatch):
+    scans = _count_scans(repo, monkeypatch)
+
+    processor._check_and_process()
+    processor._check_and_process()
+    processor._check_and_process()
+
+    assert len(scans) == 1
+    assert processor.processed == ["eml_1"]
+
+
+def test_inbox_write_triggers_a_rescan(repo, processor, monkeypatch):
+    scans = _count_scans(repo, monkeypatch)
+
+    processor._check_and_process()
+    repo.add_email_to_inbox(_email("eml_2"))
+    processor._check_and_process()
+    processor._check_and_process()
+
+    assert len(scans) == 2
+
+
+def test_outside_edit_triggers_a_rescan(repo, processor, monkeypatch):
+    scans = _count_scans(repo, monkeypatch)
+
+    processor._check_and_process()
+    # Another process appends to the inbox file
+    repo.paths["inbox"].write_text(json.dumps([_email("eml_3"), _email("eml_1")]), encoding="utf-8")
+    processor._check_and_process()
+    processor._check_and_process()
+
+    assert len(scans) == 2
+    assert "eml_3" in processor.processed
+
+
+def test_stop_flushes_buffered_marks(repo, monkeypatch):
+    repo.paths["inbox"].write_text(json.dumps([_email(f"eml_{i}") for i in range(3)]), encoding="utf-8")
+    processor = AutonomousInboxProcessor(repo=repo, use_langgraph=False, poll_interval=0.05)
+    # Long enough that only stop() can trigger the flush
+    processor.mark_flush_interval = 60.0
+    monkeypatch.setattr(processor, "_process_single_email",
+                        lambda email: processor._mark_processed(email["email_id"], ["test"], "test"))
+
+    processor.start()
+    deadline = time.monotonic() + 5.0
+    while len(processor._marks_in_flight) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert repo.get_unprocessed_emails() != []  # still buffered
+
+    started = time.monotonic()
+    processor.stop()
+
+    assert time.monotonic() - started < 5.0
+    assert repo.get_unprocessed_emails() == []
+    assert processor._marks_in_flight == set()
+
+
+def test_restart_after_stop_on_event_loop_runs_one_poller(repo, monkeypatch):
+    processor = AutonomousInboxProcessor(repo=repo, use_langgraph=False, poll_interval=0.01)
+    polls = []
+
+    def slow_poll(stop_event=None):
+        polls.append((time.monotonic(), threading.get_ident()))
+        time.sleep(0.2)
+
+    monkeypatch.setattr(processor, "_check_and_process", slow_poll)
+
+    processor.start()
+    time.sleep(0.05)  # first poll is in progress
+
+    async def stop_on_loop():
+        processor.stop()  # doesn't wait for the poll thread
+
+    asyncio.run(stop_on_loop())
+    restarted = time.monotonic()
+    processor.start()
+    time.sleep(0.8)
+    processor.stop()
+
+    # Once the old run's in-progress poll ends, only the new run polls
+    pollers = {ident for started, ident in polls if started > restarted + 0.3}
+    assert len(pollers) == 1
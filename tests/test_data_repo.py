@@ -0,0 +1,73 @@
+"""
+DataRepo Tests
+==============
+Write-path tests against temporary JSON files.
+
+Run with: python -m pytest tests/test_data_repo.py
+"""
+
+import sys
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from repos.data_repo import DataRepo
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = DataRepo()
+    repo.paths["tasks"] = tmp_path / "tasks.json"
+    repo.paths["tasks"].write_text("[]", encoding="utf-8")
+    repo.paths["inbox"] = tmp_path / "inbox.json"
+    repo.paths["inbox"].write_text(json.dumps([
+        {"email_id": "eml_1", "subject": "API migration", "body_text": "Need this by EOD", "from_email": "client@acme.com"},
+        {"email_id": "eml_2", "subject": "Lunch?", "body_text": None, "from_email": "pal@contoso.com"},
+        {"email_id": "eml_3", "subject": "Re: api Migration plan", "body_text": "See attached", "from_email": "pm@acme.com"},
+        {"email_id": "eml_4", "subject": "", "body_text": "ab", "from_email": "x@y.io"},
+    ]), encoding="utf-8")
+    return repo
+
+
+def test_concurrent_task_creation_keeps_every_task(repo):
+    errors = []
+
+    def worker(n: int) -> None:
+        for i in range(40):
+            try:
+                repo.create_task({"title": f"task {n}-{i}"})
+                repo.task_by_id("tsk_missing")
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(repo.tasks()) == 200
+    assert len(repo.task_index()) == 200
+
+
+@pytest.mark.parametrize("query", ["", "a", "ab", "api", "migration", "acme.com", "lunch?", "zzz", "api migration plan"])
+def test_trigram_candidates_match_a_substring_scan(repo, query):
+    fields = ("subject", "body_text", "from_email")
+
+    rows, candidates = repo.search_candidates("inbox", fields, query)
+    narrowed = rows if candidates is None else [rows[i] for i in candidates]
+
+    def matches(values):
+        return any(isinstance(v, str) and query in v for v in values)
+
+    expected = [r[0]["email_id"] for r in repo.lowered("inbox", fields) if matches(r[1])]
+    assert [r[0]["email_id"] for r in narrowed if matches(r[1])] == expected
+    if len(query) < 3:
+        assert candidates is None
@@ -0,0 +1,111 @@
+"""
+ReAct Agent Tests
+=================
+Runs the agent without a gateway, so decisions come from its built-in
+simulation (no LLM calls).
+
+Run with: python -m pytest tests/test_react_agent.py
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from repos.data_repo import DataRepo
+from agents.react_agent import (
+    ReActAgent, AgentState, ReasoningStep, StepType, process_email_sync, aprocess_email_sync,
+)
+
+
+EMAIL = {
+    "email_id": "eml_test_sync",
+    "from_email": "client@acme.com",
+    "subject": "URGENT: API migration",
+    "body_text": "Need this by EOD asap",
+    "received_utc": "2025-01-01T00:00:00",
+    "actionability_gt": "actionable",
+}
+
+
+@pytest.fixture
+def agent(tmp_path):
+    repo = DataRepo()
+    # Tools the agent auto-approves write tasks/drafts; keep them off the real data
+    for key in list(repo.paths):
+        path = repo.paths[key]
+        if path.suffix == ".json":
+            repo.paths[key] = tmp_path / f"{key}.json"
+            repo.paths[key].write_text(path.read_text(encoding="utf-8") if path.exists() else "[]", encoding="utf-8")
+    repo.paths["drafts"] = tmp_path / "drafts.json"
+    agent = ReActAgent(repo)
+    yield agent
+    agent.close()
+
+
+def test_process_email_sync_returns_final_state(agent):
+    state = process_email_sync(agent, EMAIL)
+
+    assert isinstance(state, AgentState)
+    assert state.email["email_id"] == EMAIL["email_id"]
+    assert state.status == "completed"
+    assert state.actions_taken
+    assert len(state.reasoning_trace) > 0
+
+
+def test_aprocess_email_sync_returns_final_state(agent):
+    state = asyncio.run(aprocess_email_sync(agent, EMAIL))
+
+    assert isinstance(state, AgentState)
+    assert state.status == "completed"
+
+
+def _record_calls(agent, monkeypatch) -> list:
+    calls = []
+
+    def execute(tool_name, params):
+        calls.append((tool_name, params))
+        return {"success": True}
+
+    monkeypatch.setattr(agent.tool_executor, "execute", execute)
+    return calls
+
+
+def _think(batch) -> ReasoningStep:
+    return ReasoningStep(step_type=StepType.THINK, content="", tool_name=batch[0][0],
+                         tool_params=batch[0][1], tool_calls=batch)
+
+
+def test_batch_with_a_write_runs_every_call_in_order(agent, monkeypatch):
+    calls = _record_calls(agent, monkeypatch)
+    batch = [
+        ("read_task", {"task_id": "tsk_1"}),
+        ("create_task", {"title": "Follow up"}),
+        ("search_tasks", {"query": "api"}),
+    ]
+    state = AgentState(goal="test", email=EMAIL)
+
+    steps = list(agent._run_iteration(state, _think(batch)))
+
+    assert calls == batch
+    assert [s.tool_name for s in steps if s.step_type == StepType.ACT] == [name for name, _ in batch]
+
+
+def test_batch_runs_a_repeated_read_once(agent, monkeypatch):
+    calls = _record_calls(agent, monkeypatch)
+    batch = [
+        ("read_task", {"task_id": "tsk_1"}),
+        ("search_tasks", {"query": "api"}),
+        ("read_task", {"task_id": "tsk_1"}),
+    ]
+    state = AgentState(goal="test", email=EMAIL)
+
+    steps = list(agent._run_iteration(state, _think(batch)))
+
+    assert sorted(calls, key=str) == sorted(batch[:2], key=str)
+    assert len([s for s in steps if s.step_type == StepType.ACT]) == 3